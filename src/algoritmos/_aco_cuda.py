@@ -0,0 +1,158 @@
+"""Construção das formigas do ACO na GPU (numba.cuda).
+
+Uma thread constrói a solução de uma formiga com a mesma regra do kernel de
+CPU (`_aco_kernel.construir_rotas`): filtro de capacidade, filtro hard de
+janela de tempo e roleta ponderada por feromônio e visibilidade.
+Visibilidade (`eta_beta`), tempos e dados dos clientes ficam na memória do
+dispositivo; `tau_alpha` é enviado a cada geração (a atualização do
+feromônio continua no host). Cada
+thread usa o próprio gerador xoroshiro128+ e linhas próprias dos buffers
+de trabalho (não visitados, candidatos e pesos), já que arrays locais de
+tamanho dinâmico não existem em kernels CUDA.
+
+Só é usado quando `CUDA_DISPONIVEL` e a instância tem ao menos
+`N_MIN_GPU` nós; abaixo disso o custo de lançamento e transferência
+supera o ganho e o ACO segue pelo caminho de CPU.
+"""
+
+import numpy as np
+
+try:
+    from numba import cuda
+    from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_uniform_float32
+    CUDA_DISPONIVEL = cuda.is_available()
+except Exception:  # pragma: no cover - depende do ambiente
+    CUDA_DISPONIVEL = False
+
+# Tamanho mínimo de instância (nós, com depósito) para usar a GPU
+N_MIN_GPU = 128
+
+_THREADS_POR_BLOCO = 64
+
+
+if CUDA_DISPONIVEL:
+
+    @cuda.jit
+    def _construir_rotas_gpu(tau_alpha, eta_beta, demandas, capacidade, usar_janelas,
+                             T, tw_ini, tw_fim, servico, estados, unv, cand, pesos,
+                             seqs, tamanhos):
+        """Uma thread por formiga; grava a sequência `0 a b 0 c 0` em `seqs[f]`."""
+        f = cuda.grid(1)
+        if f >= seqs.shape[0]:
+            return
+        n = tau_alpha.shape[0]
+        for t in range(n - 1):
+            unv[f, t] = t + 1
+        k = n - 1
+        seqs[f, 0] = 0
+        m = 1
+
+        while k > 0:
+            carga = 0.0
+            tempo = 0.0
+            atual = 0
+            tam_rota = 1
+
+            while k > 0:
+                # Primeira passada: quantos cabem na capacidade e quantos
+                # destes ainda chegam dentro da janela
+                nc = 0
+                ntw = 0
+                for t in range(k):
+                    c = unv[f, t]
+                    if carga + demandas[c] <= capacidade:
+                        nc += 1
+                        if usar_janelas and tempo + T[atual, c] <= tw_fim[c]:
+                            ntw += 1
+                if nc == 0:
+                    break
+                if usar_janelas and ntw == 0 and tam_rota > 1:
+                    break
+                filtrar_tw = usar_janelas and ntw > 0
+
+                # Segunda passada: candidatos e pesos da roleta
+                nc = 0
+                total = 0.0
+                for t in range(k):
+                    c = unv[f, t]
+                    if carga + demandas[c] > capacidade:
+                        continue
+                    if filtrar_tw and tempo + T[atual, c] > tw_fim[c]:
+                        continue
+                    w = tau_alpha[atual, c] * eta_beta[atual, c]
+                    cand[f, nc] = t
+                    pesos[f, nc] = w
+                    total += w
+                    nc += 1
+
+                if total > 0:
+                    alvo = xoroshiro128p_uniform_float32(estados, f) * total
+                    q = 0
+                    acumulado = pesos[f, 0]
+                    while acumulado < alvo and q < nc - 1:
+                        q += 1
+                        acumulado += pesos[f, q]
+                else:
+                    q = min(int(xoroshiro128p_uniform_float32(estados, f) * nc), nc - 1)
+
+                p = cand[f, q]
+                proximo = unv[f, p]
+                seqs[f, m] = proximo
+                m += 1
+                tam_rota += 1
+                carga += demandas[proximo]
+                if usar_janelas:
+                    tempo = max(tempo + T[atual, proximo], tw_ini[proximo]) + servico[proximo]
+                atual = proximo
+                unv[f, p] = unv[f, k - 1]
+                k -= 1
+
+            seqs[f, m] = 0
+            m += 1
+            if tam_rota == 1:
+                # Nenhum cliente cabe em uma rota vazia (ver kernel de CPU)
+                break
+
+        tamanhos[f] = m
+
+
+class ConstrutorGPU:
+    """Mantém os dados do ACO no dispositivo e constrói gerações inteiras.
+
+    Criado uma vez por run: copia visibilidade, tempos e dados dos clientes
+    para a GPU, aloca os buffers de trabalho de `n_formigas` threads e inicializa
+    os geradores xoroshiro128+ a partir de `seed`.
+    """
+
+    def __init__(self, aco, n_formigas, seed):
+        n = aco.n
+        self.n_formigas = n_formigas
+        self.capacidade = float(aco.capacidade)
+        self.usar_janelas = bool(aco._usar_janelas)
+
+        self.eta_beta = cuda.to_device(aco.eta_beta)
+        self.demandas = cuda.to_device(aco._demandas_arr)
+        self.T = cuda.to_device(aco._tempos_arr)
+        self.tw_ini = cuda.to_device(aco._tw_ini)
+        self.tw_fim = cuda.to_device(aco._tw_fim)
+        self.servico = cuda.to_device(aco._servico_arr)
+
+        self.estados = create_xoroshiro128p_states(n_formigas, seed=seed)
+        self.unv = cuda.device_array((n_formigas, n), dtype=np.int64)
+        self.cand = cuda.device_array((n_formigas, n), dtype=np.int64)
+        self.pesos = cuda.device_array((n_formigas, n), dtype=np.float64)
+        self.seqs = cuda.device_array((n_formigas, 2 * n), dtype=np.int64)
+        self.tamanhos = cuda.device_array(n_formigas, dtype=np.int64)
+
+    def construir(self, tau_alpha):
+        """Constrói uma geração e devolve uma sequência por formiga."""
+        tau = cuda.to_device(tau_alpha)
+        blocos = (self.n_formigas + _THREADS_POR_BLOCO - 1) // _THREADS_POR_BLOCO
+        _construir_rotas_gpu[blocos, _THREADS_POR_BLOCO](
+            tau, self.eta_beta, self.demandas, self.capacidade,
+            self.usar_janelas, self.T, self.tw_ini, self.tw_fim, self.servico,
+            self.estados, self.unv, self.cand, self.pesos, self.seqs, self.tamanhos,
+        )
+        seqs = self.seqs.copy_to_host()
+        tamanhos = self.tamanhos.copy_to_host()
+        return [seqs[f, :tamanhos[f]] for f in range(self.n_formigas)]
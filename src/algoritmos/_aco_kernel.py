@@ -0,0 +1,113 @@
+"""Kernel compilado da construção de soluções do ACO.
+
+Reproduz `ACO.construir_solucao` (filtro de capacidade, filtro hard de
+janela de tempo e roleta ponderada por feromônio e visibilidade) sobre
+arrays NumPy pré-alocados. Os não visitados ficam em `unv[:k]`; a remoção
+troca o escolhido com o último elemento ativo e decrementa `k`, em O(1).
+"""
+
+import numpy as np
+
+from utilitarios._jit import njit
+
+
+@njit(cache=True, fastmath=True)
+def construir_rotas(tau_alpha, eta_beta, demandas, capacidade,
+                    usar_janelas, T, tw_ini, tw_fim, servico, seed):
+    """Constrói uma solução e a devolve como sequência `0 a b 0 c 0 ...`.
+
+    Cada depósito (0) após o primeiro fecha uma rota. Os pesos da roleta
+    são `tau_alpha * eta_beta`, ambos pré-calculados pelo ACO. `seed`
+    inicializa o gerador interno do Numba, de modo que a construção é
+    reprodutível.
+    """
+    np.random.seed(seed)
+    n = tau_alpha.shape[0]
+    unv = np.arange(1, n)
+    k = n - 1
+    cand = np.empty(n, dtype=np.int64)
+    cand_tw = np.empty(n, dtype=np.int64)
+    pesos = np.empty(n, dtype=np.float64)
+    seq = np.empty(2 * n, dtype=np.int64)
+    seq[0] = 0
+    m = 1
+
+    while k > 0:
+        carga = 0.0
+        tempo = 0.0
+        atual = 0
+        tam_rota = 1
+
+        while k > 0:
+            nc = 0
+            for t in range(k):
+                if carga + demandas[unv[t]] <= capacidade:
+                    cand[nc] = t
+                    nc += 1
+            if nc == 0:
+                break
+
+            escolhidos = cand
+            if usar_janelas:
+                ntw = 0
+                for q in range(nc):
+                    c = unv[cand[q]]
+                    if tempo + T[atual, c] <= tw_fim[c]:
+                        cand_tw[ntw] = cand[q]
+                        ntw += 1
+                if ntw > 0:
+                    escolhidos = cand_tw
+                    nc = ntw
+                elif tam_rota > 1:
+                    break
+
+            total = 0.0
+            for q in range(nc):
+                c = unv[escolhidos[q]]
+                pesos[q] = tau_alpha[atual, c] * eta_beta[atual, c]
+                total += pesos[q]
+
+            if total > 0:
+                alvo = np.random.random() * total
+                q = 0
+                acumulado = pesos[0]
+                while acumulado < alvo and q < nc - 1:
+                    q += 1
+                    acumulado += pesos[q]
+            else:
+                q = np.random.randint(nc)
+
+            p = escolhidos[q]
+            proximo = unv[p]
+            seq[m] = proximo
+            m += 1
+            tam_rota += 1
+            carga += demandas[proximo]
+            if usar_janelas:
+                t_ch = tempo + T[atual, proximo]
+                tempo = max(t_ch, tw_ini[proximo]) + servico[proximo]
+            atual = proximo
+            unv[p] = unv[k - 1]
+            k -= 1
+
+        seq[m] = 0
+        m += 1
+        if tam_rota == 1:
+            # Nenhum cliente cabe em uma rota vazia: evita laço infinito e
+            # deixa os restantes para a penalidade de cobertura.
+            break
+
+    return seq[:m]
+
+
+def sequencia_para_rotas(seq):
+    """Converte a sequência `0 a b 0 c 0` em `[[0, a, b, 0], [0, c, 0]]`."""
+    rotas = []
+    rota = [0]
+    for no in seq[1:].tolist():
+        rota.append(no)
+        if no == 0:
+            if len(rota) > 2:
+                rotas.append(rota)
+            rota = [0]
+    return rotas
@@ -1,16 +1,17 @@
-import random
 import time
 import numpy as np
 from modelos.representacao import Representacao
 from modelos.solucao import Solucao
 from modelos.objetivo_config import ObjetivoConfig
 from utilitarios.construtivas import nearest_neighbor_capacitado
+from utilitarios.custos import deltas_2opt
+from utilitarios.aleatorio import obter_rng
 import copy
 
 class BuscaTabu:
     def __init__(self, instancia, max_iter=500, tabu_tenure=15, max_no_improve=100,
                  config=None, estrategia='sample', max_vizinhos=200,
-                 shake_inicial=10):
+                 shake_inicial=10, rng=None):
         self.inst = instancia
         self.matriz = instancia.matriz
         self.n = len(self.matriz)
@@ -23,6 +24,7 @@ class BuscaTabu:
         self.estrategia = estrategia
         self.max_vizinhos = max_vizinhos
         self.shake_inicial = shake_inicial
+        self.rng = obter_rng(rng)
 
         self.config = config if config is not None else ObjetivoConfig(
             matriz=self.matriz,
@@ -30,11 +32,17 @@ class BuscaTabu:
             n_clientes=getattr(instancia, "n_clientes", None),
         )
 
+        self.matriz_tempos = getattr(instancia, "matriz_tempos", None)
+        self.janelas_tempo = getattr(instancia, "janelas_tempo", None)
+        self.tempos_servico = getattr(instancia, "tempos_servico", None)
+        self.usar_janelas = all(x is not None for x in
+                                [self.matriz_tempos, self.janelas_tempo, self.tempos_servico])
+
     def _solucao_inicial(self):
         """Gera solução inicial NN e aplica perturbação aleatória (shake).
 
         O NN é determinístico; a perturbação injeta diversidade entre runs
-        diferentes (semente propagada via `random`), dando trajetórias
+        diferentes (semente propagada via `self.rng`), dando trajetórias
         distintas e permitindo análise estatística significativa.
         """
         sol = nearest_neighbor_capacitado(self.inst)
@@ -47,11 +55,11 @@ class BuscaTabu:
         rotas_validas = [i for i, r in enumerate(solucao.rotas) if len(r) > 3]
         if len(rotas_validas) < 2:
             return solucao
-        i, j = random.sample(rotas_validas, 2)
+        i, j = (int(k) for k in self.rng.choice(rotas_validas, 2, replace=False))
         rota_i = solucao.rotas[i]
         rota_j = solucao.rotas[j]
-        p1 = random.randint(1, len(rota_i) - 2)
-        p2 = random.randint(1, len(rota_j) - 2)
+        p1 = int(self.rng.integers(1, len(rota_i) - 1))
+        p2 = int(self.rng.integers(1, len(rota_j) - 1))
         c1, c2 = rota_i[p1], rota_j[p2]
         nova_carga_i = sum(self.demandas[n] for n in rota_i if n != 0) - self.demandas[c1] + self.demandas[c2]
         nova_carga_j = sum(self.demandas[n] for n in rota_j if n != 0) - self.demandas[c2] + self.demandas[c1]
@@ -123,21 +131,116 @@ class BuscaTabu:
 
         return Solucao(rotas=rotas, instancia=self.inst)
 
+    # --- Avaliação incremental do 2-opt intra-rota ---
+
+    def _deltas_2opt(self, rota):
+        """Matriz (L x L) com a variação de distância de cada 2-opt da rota.
+
+        `delta[i, j]` é a diferença de custo ao inverter `rota[i..j]`; posições
+        que não formam um movimento válido ficam com +inf. As arestas internas
+        do segmento invertido entram no delta, o que o mantém exato também
+        para matrizes assimétricas (OSRM). Ver `utilitarios.custos.deltas_2opt`.
+        """
+        return deltas_2opt(self.matriz, np.asarray(rota, dtype=np.intp))
+
+    def _atraso_rota(self, rota):
+        """Atraso total (min) da rota nas janelas de tempo; 0.0 sem VRPTW."""
+        if not self.usar_janelas:
+            return 0.0
+        atraso = 0.0
+        tempo_atual = 0.0
+        pos_ant = 0
+        for node in rota:
+            if node == 0:
+                continue
+            t_chegada = tempo_atual + float(self.matriz_tempos[pos_ant, node])
+            ini, fim = self.janelas_tempo[node]
+            if t_chegada > fim:
+                atraso += t_chegada - fim
+            tempo_atual = max(t_chegada, ini) + float(self.tempos_servico[node])
+            pos_ant = node
+        return atraso
+
+    def _custo_2opt(self, solucao, move_id, cur_cost, deltas, limite=float('inf')):
+        """Custo objetivo do 2-opt sem materializar a solução candidata.
+
+        O 2-opt intra-rota só altera a distância e o atraso da própria rota;
+        capacidade, cobertura e frota ficam inalteradas. Como o atraso da
+        rota nova é >= 0, `cur_cost + delta - peso * atraso_atual` é um limite
+        inferior barato: se ele já não fica abaixo de `limite`, devolve +inf
+        sem simular as janelas de tempo da rota candidata.
+        """
+        _, idx, i, j = move_id
+        if idx not in deltas:
+            rota = solucao.rotas[idx]
+            deltas[idx] = (self._deltas_2opt(rota), self._atraso_rota(rota))
+        matriz_deltas, atraso_atual = deltas[idx]
+        cand_cost = cur_cost + matriz_deltas[i, j]
+
+        if self.usar_janelas:
+            peso = self.config.peso_janela_tempo
+            cand_cost -= peso * atraso_atual
+            if cand_cost >= limite:
+                return float('inf')
+            rota = solucao.rotas[idx]
+            nova = rota[:i] + rota[i:j+1][::-1] + rota[j+1:]
+            cand_cost += peso * self._atraso_rota(nova)
+        return cand_cost
+
+    # --- Atributos tabu (pares de nós) ---
+
+    def _par_tabu(self, solucao, move_id):
+        """Par de nós (u, v) consultado na matriz tabu para um movimento.
+
+        2-opt: extremos do segmento invertido; relocate: cliente e o nó após
+        o qual seria inserido; swap: os dois clientes trocados.
+        """
+        tipo = move_id[0]
+        if tipo == '2opt_intra':
+            _, idx, i, j = move_id
+            return solucao.rotas[idx][i], solucao.rotas[idx][j]
+        if tipo == 'relocate':
+            _, io, pc, id_, pi = move_id
+            return solucao.rotas[io][pc], solucao.rotas[id_][pi - 1]
+        _, i, p1, j, p2 = move_id
+        return solucao.rotas[i][p1], solucao.rotas[j][p2]
+
+    def _par_reverso(self, solucao, move_id):
+        """Par de nós que desfaria o movimento, proibido após aplicá-lo.
+
+        Para 2-opt e swap coincide com `_par_tabu` (reaplicar desfaz); no
+        relocate proíbe devolver o cliente para depois do antigo predecessor.
+        """
+        if move_id[0] == 'relocate':
+            _, io, pc, _, _ = move_id
+            return solucao.rotas[io][pc], solucao.rotas[io][pc - 1]
+        return self._par_tabu(solucao, move_id)
+
     def _melhor_candidato(self, solucao, tabu, best_cost):
         """Seleciona o melhor candidato da vizinhança conforme a estratégia."""
         if self.estrategia == 'sample':
             moves = list(self._gerar_todos_moves(solucao))
             if len(moves) > self.max_vizinhos:
-                moves = random.sample(moves, self.max_vizinhos)
+                escolhidos = self.rng.choice(len(moves), self.max_vizinhos, replace=False)
+                moves = [moves[k] for k in escolhidos]
         else:
             moves = self._gerar_todos_moves(solucao)
 
         best_cand, best_cand_cost, best_move = None, float('inf'), None
+        cur_cost = solucao.custo_objetivo
+        deltas = {}
 
         for move_id in moves:
-            is_tabu = tabu.get(move_id, 0) > 0
-            candidate = self._aplicar_move(solucao, move_id)
-            cand_cost = self._avaliar_solucao(candidate)
+            is_tabu = tabu[self._par_tabu(solucao, move_id)] > 0
+            if move_id[0] == '2opt_intra':
+                # Tabu só interessa se atingir a aspiração (< best_cost);
+                # qualquer candidato precisa ainda superar o melhor da vizinhança.
+                limite = min(best_cand_cost, best_cost) if is_tabu else best_cand_cost
+                candidate = None
+                cand_cost = self._custo_2opt(solucao, move_id, cur_cost, deltas, limite)
+            else:
+                candidate = self._aplicar_move(solucao, move_id)
+                cand_cost = self._avaliar_solucao(candidate)
 
             if is_tabu and cand_cost >= best_cost:
                 continue
@@ -149,6 +252,11 @@ class BuscaTabu:
                 if self.estrategia == 'first' and cand_cost < best_cost:
                     break
 
+        # 2-opt vencedor avaliado por delta: materializa só o movimento escolhido
+        if best_move is not None and best_cand is None:
+            best_cand = self._aplicar_move(solucao, best_move)
+            best_cand_cost = self._avaliar_solucao(best_cand)
+
         return best_cand, best_cand_cost, best_move
 
     def run(self):
@@ -160,8 +268,8 @@ class BuscaTabu:
         best = copy.deepcopy(current)
         best_cost = best.custo_objetivo
 
-        # lista tabu: move_id → tenure restante
-        tabu = dict()
+        # matriz tabu densa: tenure restante por par de nós (u, v)
+        tabu = np.zeros((self.n, self.n), dtype=np.int16)
         iter_no_improve = 0
         historico = []
 
@@ -172,16 +280,12 @@ class BuscaTabu:
             if neighborhood_best is None:
                 break
 
+            u, v = self._par_reverso(current, neighborhood_best_move)
             current = neighborhood_best
 
-            # decrementar tenure e adicionar o movimento escolhido
-            keys = list(tabu.keys())
-            for k in keys:
-                tabu[k] -= 1
-                if tabu[k] <= 0:
-                    del tabu[k]
-
-            tabu[neighborhood_best_move] = self.tabu_tenure
+            # decrementar tenure (vetorizado) e proibir desfazer o movimento
+            np.subtract(tabu, 1, out=tabu, where=tabu > 0)
+            tabu[u, v] = tabu[v, u] = self.tabu_tenure
 
             if neighborhood_best_cost < best_cost:
                 best = copy.deepcopy(neighborhood_best)
@@ -4,11 +4,40 @@ from modelos.solucao import Solucao
 from modelos.objetivo_config import ObjetivoConfig
 from utilitarios.construtivas import nearest_neighbor_capacitado
 from utilitarios.local_search import two_opt_intra, busca_local
-import random
+from utilitarios._jit import NUMBA_DISPONIVEL
+from utilitarios.aleatorio import obter_rng
+from algoritmos._aco_kernel import construir_rotas, sequencia_para_rotas
+from algoritmos import _aco_cuda
 import time
+import copy
+import multiprocessing
+from multiprocessing import shared_memory
+
+# Estado de cada processo do Pool de formigas (preenchido pelo inicializador)
+_ESTADO_WORKER = {}
+
+
+def _iniciar_worker(aco, shm_nome, shape, dtype):
+    """Inicializador do Pool: recebe o ACO uma única vez por processo e
+    associa `tau_alpha` ao bloco de memória compartilhada do processo pai."""
+    shm = shared_memory.SharedMemory(name=shm_nome)
+    aco.tau_alpha = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _ESTADO_WORKER["aco"] = aco
+    _ESTADO_WORKER["shm"] = shm
+
+
+def _aco_uma_formiga(seed):
+    """Constrói a solução de uma formiga em um processo do Pool."""
+    aco = _ESTADO_WORKER["aco"]
+    aco.rng = np.random.default_rng(seed)
+    solucao = aco.construir_solucao()
+    solucao.instancia = None  # religada no processo pai
+    return solucao
+
 
 class ACO:
-    def __init__(self, instancia, n_formigas=10, iter=20, alpha=1.0, beta=2.0, evaporacao=0.1, config=None):
+    def __init__(self, instancia, n_formigas=10, iter=20, alpha=1.0, beta=2.0, evaporacao=0.1, config=None,
+                 n_processos=1, rng=None):
         self.inst = instancia
         self.matriz = instancia.matriz
         self.n = len(self.matriz)
@@ -20,6 +49,11 @@ class ACO:
         self.alpha = alpha
         self.beta = beta
         self.evaporacao = evaporacao
+        # Processos para construir as formigas de uma geração em paralelo.
+        # Não combinar com N_PROCESSOS > 1 no comparador: processos do Pool
+        # não podem criar Pools próprios.
+        self.n_processos = n_processos
+        self.rng = obter_rng(rng)
 
         self.config = config if config is not None else ObjetivoConfig(
             matriz=self.matriz,
@@ -27,11 +61,63 @@ class ACO:
             n_clientes=getattr(instancia, "n_clientes", None),
         )
         self.feromonio = np.ones((self.n, self.n))
+        # Termos da roleta pré-calculados: visibilidade (1/d)^beta uma vez
+        # por run e feromônio^alpha a cada atualização do feromônio.
+        seguro = np.where(self.matriz > 0, self.matriz, 0.0001).astype(np.float64)
+        self.eta_beta = np.ascontiguousarray(seguro ** (-self.beta))
+        self.tau_alpha = self.feromonio ** self.alpha
+
+        # Entradas do kernel compilado de construção (arrays contíguos)
+        matriz_tempos = getattr(instancia, "matriz_tempos", None)
+        janelas_tempo = getattr(instancia, "janelas_tempo", None)
+        tempos_servico = getattr(instancia, "tempos_servico", None)
+        self._usar_janelas = all(x is not None for x in [matriz_tempos, janelas_tempo, tempos_servico])
+        self._demandas_arr = np.asarray(self.demandas, dtype=np.float64)
+        if self._usar_janelas:
+            janelas = np.asarray(janelas_tempo, dtype=np.float64)
+            self._tempos_arr = np.ascontiguousarray(matriz_tempos, dtype=np.float64)
+            self._tw_ini, self._tw_fim = janelas[:, 0].copy(), janelas[:, 1].copy()
+            self._servico_arr = np.asarray(tempos_servico, dtype=np.float64)
+        else:
+            self._tempos_arr = np.zeros((1, 1))
+            self._tw_ini = self._tw_fim = self._servico_arr = np.zeros(1)
+
+        # Construção na GPU (uma thread por formiga) para instâncias grandes;
+        # o construtor é criado no primeiro uso, dentro do run.
+        self._usar_gpu = _aco_cuda.CUDA_DISPONIVEL and self.n >= _aco_cuda.N_MIN_GPU
+        self._gpu = None
 
     def construir_solucao(self):
-        """Constrói uma solução CVRP/VRPTW completa usando feromônios para guiar a construção."""
+        """Constrói uma solução CVRP/VRPTW completa usando feromônios para guiar a construção.
+
+        Com o Numba disponível a construção roda no kernel compilado
+        (`_aco_kernel.construir_rotas`), semeado a partir de `self.rng`;
+        caso contrário usa a implementação em Python puro.
+        """
+        if NUMBA_DISPONIVEL:
+            seq = construir_rotas(
+                self.tau_alpha, self.eta_beta, self._demandas_arr, float(self.capacidade),
+                self._usar_janelas, self._tempos_arr, self._tw_ini, self._tw_fim,
+                self._servico_arr, int(self.rng.integers(2**32)),
+            )
+            solucao = Solucao(rotas=sequencia_para_rotas(seq), instancia=self.inst)
+            return two_opt_intra(solucao, self.inst, self.config)
+        return self._construir_solucao_python()
+
+    def _construir_solucao_python(self):
+        """Construção em Python puro (sem Numba).
+
+        Mesma estrutura do kernel: candidatos são posições em `nao_visitados`,
+        a roleta sorteia um índice e o escolhido sai da lista por troca com o
+        último elemento + `pop()`, em O(1). Os sorteios da roleta (no máximo
+        um por cliente) são gerados de uma vez no início da construção.
+        """
         deposito = 0
-        nao_visitados = set(range(1, self.n))
+        nao_visitados = list(range(1, self.n))
+        tau_alpha = self.tau_alpha
+        eta_beta = self.eta_beta
+        sorteios = self.rng.random(self.n)
+        passo = 0
         rotas = []
 
         # Atributos opcionais para VRPTW (graceful degradation se ausentes)
@@ -47,7 +133,7 @@ class ACO:
             posicao_atual = deposito
 
             while nao_visitados:
-                candidatos_cap = [c for c in nao_visitados
+                candidatos_cap = [t for t, c in enumerate(nao_visitados)
                                   if carga_atual + self.demandas[c] <= self.capacidade]
 
                 if not candidatos_cap:
@@ -60,10 +146,11 @@ class ACO:
                 # para não deixar cliente órfão (a penalidade será avaliada).
                 if usar_janelas:
                     candidatos_tw = []
-                    for c in candidatos_cap:
-                        t_ch = tempo_atual + float(matriz_tempos[posicao_atual][c])
+                    for t in candidatos_cap:
+                        c = nao_visitados[t]
+                        t_ch = tempo_atual + float(matriz_tempos[posicao_atual, c])
                         if t_ch <= janelas_tempo[c][1]:
-                            candidatos_tw.append(c)
+                            candidatos_tw.append(t)
                     if candidatos_tw:
                         candidatos = candidatos_tw
                     elif len(rota) == 1:
@@ -73,14 +160,8 @@ class ACO:
                 else:
                     candidatos = candidatos_cap
 
-                probabilidades = []
-                for j in candidatos:
-                    distancia = self.matriz[posicao_atual][j] or 0.0001
-                    tau = self.feromonio[posicao_atual][j] ** self.alpha
-                    eta = (1.0 / distancia) ** self.beta
-                    probabilidades.append(tau * eta)
-
-                probabilidades = np.array(probabilidades)
+                destinos = [nao_visitados[t] for t in candidatos]
+                probabilidades = tau_alpha[posicao_atual, destinos] * eta_beta[posicao_atual, destinos]
                 soma = probabilidades.sum()
                 if soma > 0:
                     probabilidades = probabilidades / soma
@@ -88,19 +169,24 @@ class ACO:
                     # todas zero, distribuição uniforme
                     probabilidades = np.ones(len(candidatos)) / len(candidatos)
 
-                proximo = random.choices(candidatos, weights=probabilidades)[0]
+                acumulada = np.cumsum(probabilidades)
+                q = int(np.searchsorted(acumulada, sorteios[passo] * acumulada[-1], side="right"))
+                pos = candidatos[min(q, len(candidatos) - 1)]
+                passo += 1
+                proximo = nao_visitados[pos]
 
                 rota.append(proximo)
                 carga_atual += self.demandas[proximo]
 
                 # Atualizar tempo acumulado (considera espera em early arrival)
                 if usar_janelas:
-                    t_ch = tempo_atual + float(matriz_tempos[posicao_atual][proximo])
+                    t_ch = tempo_atual + float(matriz_tempos[posicao_atual, proximo])
                     ini_p = janelas_tempo[proximo][0]
                     tempo_atual = max(t_ch, ini_p) + float(tempos_servico[proximo])
 
                 posicao_atual = proximo
-                nao_visitados.remove(proximo)
+                nao_visitados[pos] = nao_visitados[-1]
+                nao_visitados.pop()
 
             rota.append(deposito)
             rotas.append(rota)
@@ -114,30 +200,93 @@ class ACO:
         self.feromonio *= (1 - self.evaporacao)
 
         for solucao in solucoes:
+            if not solucao.rotas:
+                continue
             # custo_objetivo penaliza soluções inviáveis, então usamos ele como base
             delta = 1.0 / (solucao.custo_objetivo if solucao.custo_objetivo else solucao.custo)
 
-            for rota in solucao.rotas:
-                for i in range(len(rota) - 1):
-                    a = rota[i]
-                    b = rota[i + 1]
-                    self.feromonio[a][b] += delta
-                    self.feromonio[b][a] += delta
+            # Todas as arestas da solução de uma vez; as rotas já terminam no
+            # depósito, então a aresta de retorno está incluída. `add.at`
+            # acumula corretamente arestas repetidas (ex.: rota 0 → c → 0).
+            rotas = [np.asarray(rota, dtype=np.intp) for rota in solucao.rotas]
+            a = np.concatenate([r[:-1] for r in rotas])
+            b = np.concatenate([r[1:] for r in rotas])
+            np.add.at(self.feromonio, (a, b), delta)
+            np.add.at(self.feromonio, (b, a), delta)
+
+        np.power(self.feromonio, self.alpha, out=self.tau_alpha)
+
+    def _construir_geracao(self, pool):
+        """Constrói as `n_formigas` soluções de uma geração.
+
+        Com Pool, cada formiga recebe uma seed sorteada do `self.rng` do
+        processo pai, mantendo o run reprodutível; `tau_alpha` é lido da
+        memória compartilhada, sem serialização por geração.
+        """
+        if pool is None and self._usar_gpu:
+            return self._construir_geracao_gpu()
+        if pool is None:
+            return [self.construir_solucao() for _ in range(self.n_formigas)]
+
+        seeds = self.rng.integers(2**63, size=self.n_formigas).tolist()
+        solucoes = pool.map(_aco_uma_formiga, seeds)
+        for solucao in solucoes:
+            solucao.instancia = self.inst
+        return solucoes
+
+    def _construir_geracao_gpu(self):
+        """Constrói a geração inteira na GPU e aplica o 2-opt no host."""
+        if self._gpu is None:
+            self._gpu = _aco_cuda.ConstrutorGPU(self, self.n_formigas,
+                                                seed=int(self.rng.integers(2**63)))
+        solucoes = []
+        for seq in self._gpu.construir(self.tau_alpha):
+            solucao = Solucao(rotas=sequencia_para_rotas(seq), instancia=self.inst)
+            solucoes.append(two_opt_intra(solucao, self.inst, self.config))
+        return solucoes
 
     def run(self):
         """Executa o algoritmo ACO para CVRP."""
+        # Com a GPU ativa as formigas já são construídas em paralelo nela
+        if not self._usar_gpu and (self.n_processos is None or self.n_processos > 1):
+            return self._run_paralelo()
+        return self._run(pool=None)
+
+    def _run_paralelo(self):
+        """Executa `_run` com um Pool persistente e `tau_alpha` em memória compartilhada.
+
+        Os processos só leem `tau_alpha`; o feromônio em si fica no processo pai.
+        """
+        shm = shared_memory.SharedMemory(create=True, size=self.tau_alpha.nbytes)
+        compartilhado = np.ndarray(self.tau_alpha.shape, dtype=self.tau_alpha.dtype, buffer=shm.buf)
+        compartilhado[:] = self.tau_alpha
+        self.tau_alpha = compartilhado
+        try:
+            base = copy.copy(self)
+            base.feromonio = base.tau_alpha = None
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(
+                processes=self.n_processos,
+                initializer=_iniciar_worker,
+                initargs=(base, shm.name, compartilhado.shape, compartilhado.dtype),
+            ) as pool:
+                return self._run(pool)
+        finally:
+            self.tau_alpha = np.array(self.tau_alpha)
+            del compartilhado
+            shm.close()
+            shm.unlink()
+
+    def _run(self, pool):
         melhor_solucao = None
         melhor_custo_objetivo = float("inf")
         historico = []
         start = time.time()
 
         for it in range(self.iter):
-            solucoes = []
-
-            for f in range(self.n_formigas):
-                solucao = self.construir_solucao()
-                solucoes.append(solucao)
+            solucoes = self._construir_geracao(pool)
 
+            for solucao in solucoes:
                 if solucao.custo_objetivo < melhor_custo_objetivo:
                     melhor_solucao = solucao
                     melhor_custo_objetivo = solucao.custo_objetivo
@@ -1,4 +1,3 @@
-import random
 import time
 import numpy as np
 from modelos.representacao import Representacao
@@ -6,6 +5,8 @@ from modelos.solucao import Solucao
 from modelos.objetivo_config import ObjetivoConfig
 from utilitarios.construtivas import nearest_neighbor_capacitado
 from utilitarios.local_search import two_opt_intra, busca_local
+from utilitarios._jit import njit
+from utilitarios.aleatorio import obter_rng
 
 def split_into_routes(permutation, instancia):
     """
@@ -34,7 +35,7 @@ def split_into_routes(permutation, instancia):
         viola_cap = carga_atual + demanda_cliente > capacidade
         viola_tw = False
         if usar_janelas:
-            t_ch = tempo_atual + float(matriz_tempos[pos_ant][cliente])
+            t_ch = tempo_atual + float(matriz_tempos[pos_ant, cliente])
             viola_tw = t_ch > janelas[cliente][1]
 
         if (viola_cap or viola_tw) and len(rota_atual) > 1:
@@ -48,7 +49,7 @@ def split_into_routes(permutation, instancia):
         rota_atual.append(cliente)
         carga_atual += demanda_cliente
         if usar_janelas:
-            t_ch = tempo_atual + float(matriz_tempos[pos_ant][cliente])
+            t_ch = tempo_atual + float(matriz_tempos[pos_ant, cliente])
             tempo_atual = max(t_ch, janelas[cliente][0]) + float(tempos_servico[cliente])
             pos_ant = cliente
 
@@ -60,37 +61,76 @@ def split_into_routes(permutation, instancia):
     return solucao
 
 
-def apply_swaps(permutation, swaps):
-    """Aplica uma sequência de trocas a uma permutação."""
-    p = permutation[:]
-    for (i, j) in swaps:
-        if 0 <= i < len(p) and 0 <= j < len(p):
-            p[i], p[j] = p[j], p[i]
-    return p
-
-
-def generate_swaps_to_move(a, b):
+@njit(cache=True)
+def _trocas_disparadas(a, alvo, r, c, trab, pos, out, k):
     """
-    Gera sequência de trocas para transformar a permutação a em b.
-
-    Usado para calcular a "velocidade" no PSO: a diferença entre
-    posição atual e pbest/gbest é expressa como lista de swaps.
+    Gera as trocas que transformam `a` em `alvo` (simuladas em `trab`) e
+    grava em `out[k:]` apenas as que disparam (`r[t] < c` para a t-ésima
+    troca). Retorna o novo total de trocas em `out`.
+    """
+    n = a.shape[0]
+    for idx in range(n):
+        trab[idx] = a[idx]
+        pos[a[idx]] = idx
+    t = 0
+    for i in range(n):
+        if trab[i] != alvo[i]:
+            j = pos[alvo[i]]
+            if r[t] < c:
+                out[k, 0] = i
+                out[k, 1] = j
+                k += 1
+            t += 1
+            trab[i], trab[j] = trab[j], trab[i]
+            pos[trab[j]] = j
+            pos[trab[i]] = i
+    return k
+
+
+@njit(cache=True)
+def pso_step(particle, pbest, gbest, c1, c2, swap_inercia, r_pbest, r_gbest, trab, pos, trocas):
+    """
+    Atualiza uma partícula in-place em uma única chamada compilada.
+
+    A "velocidade" é a diferença até o pbest e até o gbest expressa como
+    sequências de swaps, ambas calculadas a partir da posição atual; cada
+    swap dispara com probabilidade c1/c2 (sorteios em `r_pbest`/`r_gbest`).
+    O swap de inércia (`swap_inercia`, ou None quando não dispara) e os
+    swaps disparados são compostos em uma única permutação líquida (pares
+    repetidos se cancelam), aplicada de uma vez. `trab`, `pos` e `trocas`
+    são buffers reutilizados (`pos` com tamanho >= maior cliente + 1,
+    `trocas` com 2 * len(particle) + 1 linhas). Retorna quantas posições
+    mudaram; 0 indica que a partícula ficou igual.
     """
-    swaps = []
-    a = a[:]
-    pos = {val: idx for idx, val in enumerate(a)}
-    for i in range(len(a)):
-        if a[i] != b[i]:
-            j = pos[b[i]]
-            swaps.append((i, j))
-            a[i], a[j] = a[j], a[i]
-            pos[a[j]] = j
-            pos[a[i]] = i
-    return swaps
+    k = 0
+    if swap_inercia is not None:
+        trocas[0, 0] = swap_inercia[0]
+        trocas[0, 1] = swap_inercia[1]
+        k = 1
+    k = _trocas_disparadas(particle, pbest, r_pbest, c1, trab, pos, trocas, k)
+    k = _trocas_disparadas(particle, gbest, r_gbest, c2, trab, pos, trocas, k)
+
+    # Permutação líquida em `pos[:n]`: perm[i] = posição de origem
+    n = particle.shape[0]
+    for i in range(n):
+        pos[i] = i
+    for t in range(k):
+        i, j = trocas[t, 0], trocas[t, 1]
+        pos[i], pos[j] = pos[j], pos[i]
+
+    movidos = 0
+    for i in range(n):
+        trab[i] = particle[pos[i]]
+        if pos[i] != i:
+            movidos += 1
+    if movidos > 0:
+        particle[:] = trab
+    return movidos
 
 
 class PSO:
-    def __init__(self, instancia, n_particles=20, max_iter=100, c1=0.6, c2=0.6, inertia=0.9, config=None):
+    def __init__(self, instancia, n_particles=20, max_iter=100, c1=0.6, c2=0.6, inertia=0.9, config=None,
+                 rng=None):
         self.inst = instancia
         self.matriz = instancia.matriz
         self.n = len(self.matriz)
@@ -101,6 +141,7 @@ class PSO:
         self.c1 = c1        # peso cognitivo (atração ao pbest)
         self.c2 = c2        # peso social (atração ao gbest)
         self.inertia = inertia
+        self.rng = obter_rng(rng)
 
         self.config = config if config is not None else ObjetivoConfig(
             matriz=self.matriz,
@@ -110,73 +151,77 @@ class PSO:
 
     def _random_perm(self):
         """Permutação aleatória dos clientes (sem depósito)."""
-        p = list(range(1, self.n))
-        random.shuffle(p)
-        return p
+        return self.rng.permutation(np.arange(1, self.n, dtype=np.int64))
 
     def _evaluate_permutation(self, perm):
         """Decodifica a permutação em rotas e avalia a função objetivo."""
-        solucao = split_into_routes(perm, self.inst)
+        solucao = split_into_routes(perm.tolist(), self.inst)
         solucao = two_opt_intra(solucao, self.inst, self.config)
         return solucao.custo_objetivo, solucao
 
     def run(self):
         start = time.time()
 
-        particles = [self._random_perm() for _ in range(self.n_particles)]
+        n_pos = self.n_clientes
 
-        pbest_costs = []
-        pbests = []
+        # Enxame em buffers 2D pré-alocados (uma linha por partícula);
+        # atualizações são cópias de linha com np.copyto, sem novas listas.
+        particles = np.empty((self.n_particles, n_pos), dtype=np.int64)
+        for i in range(self.n_particles):
+            particles[i] = self._random_perm()
+        pbests = particles.copy()
+        pbest_costs = np.empty(self.n_particles)
         solucoes = []
 
-        for p in particles:
-            cost, sol = self._evaluate_permutation(p)
-            pbests.append(list(p))
-            pbest_costs.append(cost)
+        for i in range(self.n_particles):
+            cost, sol = self._evaluate_permutation(particles[i])
+            pbest_costs[i] = cost
             solucoes.append(sol)
 
         gbest_idx = int(np.argmin(pbest_costs))
-        gbest = list(pbests[gbest_idx])
+        gbest = np.empty(n_pos, dtype=np.int64)
+        np.copyto(gbest, pbests[gbest_idx])
         gbest_cost = pbest_costs[gbest_idx]
         gbest_solucao = solucoes[gbest_idx]
 
         historico = []
 
+        # Buffers reutilizados por todas as partículas: permutação de
+        # trabalho, posições (pos[valor] = índice) e trocas escolhidas.
+        trab = np.empty(n_pos, dtype=np.int64)
+        pos = np.empty(self.n, dtype=np.int64)
+        trocas = np.empty((2 * n_pos + 1, 2), dtype=np.int64)
         for it in range(self.max_iter):
+            # Sorteios da iteração gerados em lote: inércia, posições do swap
+            # aleatório e filtros dos swaps rumo ao pbest/gbest (no máximo
+            # n_pos - 1 swaps em cada sequência).
+            r_inertia = self.rng.random(self.n_particles)
+            r_swap = self.rng.integers(n_pos, size=(self.n_particles, 2)) if n_pos > 0 else None
+            r_pbest = self.rng.random((self.n_particles, n_pos))
+            r_gbest = self.rng.random((self.n_particles, n_pos))
+
             for i in range(self.n_particles):
                 current = particles[i]
 
-                swaps_to_pbest = generate_swaps_to_move(current, pbests[i])
-                swaps_to_gbest = generate_swaps_to_move(current, gbest)
-
-                chosen_swaps = []
-
-                # inércia: swap aleatório para manter diversidade
-                if random.random() < self.inertia and len(current) > 1:
-                    a = random.randrange(len(current))
-                    b = random.randrange(len(current))
-                    chosen_swaps.append((a, b))
-
-                for sw in swaps_to_pbest:
-                    if random.random() < self.c1:
-                        chosen_swaps.append(sw)
-
-                for sw in swaps_to_gbest:
-                    if random.random() < self.c2:
-                        chosen_swaps.append(sw)
+                swap_inercia = None
+                if r_inertia[i] < self.inertia and len(current) > 1:
+                    swap_inercia = r_swap[i]
 
-                new = apply_swaps(current, chosen_swaps) if chosen_swaps else current[:]
-                particles[i] = new
+                movidos = pso_step(current, pbests[i], gbest, self.c1, self.c2,
+                                   swap_inercia, r_pbest[i], r_gbest[i], trab, pos, trocas)
+                if movidos == 0:
+                    # Permutação identidade: custo inalterado, nunca supera o pbest
+                    continue
 
-                cost, sol = self._evaluate_permutation(new)
+                cost, sol = self._evaluate_permutation(current)
 
                 if cost < pbest_costs[i]:
-                    pbests[i] = list(new)
+                    np.copyto(pbests[i], current)
                     pbest_costs[i] = cost
                     solucoes[i] = sol
 
                     if cost < gbest_cost:
-                        gbest = list(new)
+                        np.copyto(gbest, current)
                         gbest_cost = cost
                         gbest_solucao = sol
 
@@ -41,7 +41,7 @@ class SolverExato:
         def distance_callback(from_idx, to_idx):
             i = manager.IndexToNode(from_idx)
             j = manager.IndexToNode(to_idx)
-            return int(inst.matriz[i][j])
+            return int(inst.matriz[i, j])
 
         transit_cb = routing.RegisterTransitCallback(distance_callback)
         routing.SetArcCostEvaluatorOfAllVehicles(transit_cb)
@@ -70,8 +70,8 @@ class SolverExato:
             def time_callback(from_idx, to_idx):
                 i = manager.IndexToNode(from_idx)
                 j = manager.IndexToNode(to_idx)
-                travel = int(matriz_tempos[i][j])
-                service = int(tempos_servico[i]) if tempos_servico else 0
+                travel = int(matriz_tempos[i, j])
+                service = int(tempos_servico[i]) if tempos_servico is not None else 0
                 return travel + service
 
             time_cb = routing.RegisterTransitCallback(time_callback)
@@ -14,16 +14,20 @@ Saída em `resultados/`:
 """
 
 import time
+import inspect
 import numpy as np
 import csv
 import statistics
 import os
 import random
 import pickle
+import copy
+import multiprocessing
+from multiprocessing import shared_memory
 
 from scipy import stats
 
-from config_experimento import INSTANCIAS, N_RUNS, SEED_BASE
+from config_experimento import INSTANCIAS, N_RUNS, SEED_BASE, N_PROCESSOS
 from modelos.instancia import Instancia
 from algoritmos.colonia_formigas import ACO
 from algoritmos.busca_tabu import BuscaTabu
@@ -51,64 +55,159 @@ ALGORITMOS_HEURISTICOS = [
 ]
 
 
-def executar_algoritmo(name, solver_cls, instancia, runs, seed_base, solver_kwargs=None):
+# Matrizes da instância que os solvers leem; no Pool vão por memória compartilhada
+_MATRIZES_COMPARTILHADAS = ("matriz", "matriz_tempos")
+
+# Estado de cada processo do Pool de runs (preenchido pelo inicializador)
+_ESTADO_WORKER = {}
+
+
+def _iniciar_worker(instancia, blocos):
+    """Inicializador do Pool: recebe a instância (sem as matrizes) uma única
+    vez por processo e religa cada matriz ao seu bloco de memória
+    compartilhada, descrito em `blocos` como {atributo: (nome, shape, dtype)}."""
+    shms = []
+    for atributo, (nome, shape, dtype) in blocos.items():
+        shm = shared_memory.SharedMemory(name=nome)
+        setattr(instancia, atributo, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+        shms.append(shm)
+    _ESTADO_WORKER["instancia"] = instancia
+    _ESTADO_WORKER["shms"] = shms
+
+
+def _executar_run(args):
+    """Executa um único run de um algoritmo e devolve o dict de métricas.
+
+    Função de nível de módulo para poder ser despachada pelo `Pool`. Cada
+    run é independente: semeia `random`/`np.random` com a própria seed e
+    só depende da instância e dos parâmetros recebidos. Com `instancia`
+    None usa a instância do processo (ver `_iniciar_worker`).
+    """
+    name, solver_cls, instancia, r, seed, solver_kwargs = args
+    if instancia is None:
+        instancia = _ESTADO_WORKER["instancia"]
+    random.seed(seed)
+    np.random.seed(seed)
+
+    # Meta-heurísticas recebem um Generator próprio semeado pelo run
+    if "rng" in inspect.signature(solver_cls).parameters:
+        solver_kwargs = {**solver_kwargs, "rng": np.random.default_rng(seed)}
+
+    solver = solver_cls(instancia, **solver_kwargs)
+    t0 = time.time()
+    sol = solver.run()
+    t1 = time.time()
+    tempo = t1 - t0
+
+    if sol.custo_objetivo is None:
+        sol.avaliar(instancia)
+
+    eh_valida = sol.eh_valida(instancia)
+    n_violacoes = sol.violacoes.get("capacidade", 0)
+    clientes_faltando = sol.violacoes.get("cobertura", 0)
+    frota_excedida = sol.violacoes.get("frota_excedida", 0)
+
+    n_violacoes_jt, total_atraso_jt = 0, 0.0
+    if getattr(instancia, "matriz_tempos", None) is not None:
+        vjt = sol.verificar_janelas_tempo(instancia)
+        n_violacoes_jt = sum(len(v) for v in vjt.values())
+        total_atraso_jt = sum(a for lst in vjt.values() for (_, a) in lst)
+
+    meta = getattr(sol, "meta", {}) or {}
+    historico = list(meta.get("historico_convergencia", []))
+    max_iter = meta.get("max_iter", len(historico))
+
+    # A instância é religada no processo pai; evita serializá-la de volta
+    sol.instancia = None
+
+    return {
+        "algoritmo": name,
+        "run": r,
+        "seed": seed,
+        "custo": sol.custo,
+        "custo_objetivo": sol.custo_objetivo,
+        "n_veiculos": sol.n_veiculos,
+        "eh_valida": eh_valida,
+        "n_violacoes": n_violacoes,
+        "clientes_faltando": clientes_faltando,
+        "frota_excedida": frota_excedida,
+        "n_violacoes_jt": n_violacoes_jt,
+        "total_atraso_jt": total_atraso_jt,
+        "solucao": sol,
+        "tempo": tempo,
+        "historico": historico,
+        "max_iter": max_iter,
+    }
+
+
+def executar_algoritmo(name, solver_cls, instancia, runs, seed_base, solver_kwargs=None,
+                       n_processos=1):
     """Executa um algoritmo `runs` vezes e retorna uma lista de dicts por run.
 
     Cada dict contém as métricas padrão + o histórico de convergência
     extraído de `sol.meta["historico_convergencia"]`.
+
+    Os runs são independentes e, com mais de um processo, são distribuídos
+    em um `multiprocessing.Pool` (contexto "spawn", o mesmo comportamento
+    em Linux e Windows). `n_processos=None` usa `os.cpu_count()`; com 1
+    processo (padrão) ou 1 run a execução é sequencial no próprio processo.
+    A ordem dos resultados, as seeds e os custos não dependem do
+    paralelismo, mas o `tempo` de cada run (relógio de parede) sim: runs
+    concorrentes disputam CPU e ficam mais lentos que um run isolado.
+
+    No Pool, a instância é enviada uma vez por processo (inicializador) e
+    as matrizes de distâncias/tempos ficam em memória compartilhada, sem
+    serialização por run.
     """
-    results = []
     solver_kwargs = solver_kwargs or {}
 
-    for r in range(runs):
-        random.seed(seed_base + r)
-        np.random.seed(seed_base + r)
-
-        solver = solver_cls(instancia, **solver_kwargs)
-        t0 = time.time()
-        sol = solver.run()
-        t1 = time.time()
-        tempo = t1 - t0
-
-        if sol.custo_objetivo is None:
-            sol.avaliar(instancia)
-
-        eh_valida = sol.eh_valida(instancia)
-        n_violacoes = sol.violacoes.get("capacidade", 0)
-        clientes_faltando = sol.violacoes.get("cobertura", 0)
-        frota_excedida = sol.violacoes.get("frota_excedida", 0)
-
-        n_violacoes_jt, total_atraso_jt = 0, 0.0
-        if getattr(instancia, "matriz_tempos", None) is not None:
-            vjt = sol.verificar_janelas_tempo(instancia)
-            n_violacoes_jt = sum(len(v) for v in vjt.values())
-            total_atraso_jt = sum(a for lst in vjt.values() for (_, a) in lst)
-
-        meta = getattr(sol, "meta", {}) or {}
-        historico = list(meta.get("historico_convergencia", []))
-        max_iter = meta.get("max_iter", len(historico))
-
-        results.append({
-            "algoritmo": name,
-            "run": r,
-            "seed": seed_base + r,
-            "custo": sol.custo,
-            "custo_objetivo": sol.custo_objetivo,
-            "n_veiculos": sol.n_veiculos,
-            "eh_valida": eh_valida,
-            "n_violacoes": n_violacoes,
-            "clientes_faltando": clientes_faltando,
-            "frota_excedida": frota_excedida,
-            "n_violacoes_jt": n_violacoes_jt,
-            "total_atraso_jt": total_atraso_jt,
-            "solucao": sol,
-            "tempo": tempo,
-            "historico": historico,
-            "max_iter": max_iter,
-        })
+    n_processos = n_processos or os.cpu_count() or 1
+    n_processos = min(n_processos, runs)
+
+    if n_processos <= 1:
+        results = [
+            _executar_run((name, solver_cls, instancia, r, seed_base + r, solver_kwargs))
+            for r in range(runs)
+        ]
+    else:
+        tarefas = [
+            (name, solver_cls, None, r, seed_base + r, solver_kwargs)
+            for r in range(runs)
+        ]
+        results = _executar_pool(instancia, tarefas, n_processos)
+
+    for res in results:
+        res["solucao"].instancia = instancia
     return results
 
 
+def _executar_pool(instancia, tarefas, n_processos):
+    """Despacha `tarefas` em um Pool com as matrizes da instância em memória compartilhada."""
+    base = copy.copy(instancia)
+    blocos = {}
+    shms = []
+    try:
+        for atributo in _MATRIZES_COMPARTILHADAS:
+            valor = getattr(instancia, atributo, None)
+            if valor is None:
+                continue
+            arr = np.ascontiguousarray(valor)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            shms.append(shm)
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+            blocos[atributo] = (shm.name, arr.shape, arr.dtype)
+            setattr(base, atributo, None)
+
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(processes=n_processos, initializer=_iniciar_worker,
+                      initargs=(base, blocos)) as pool:
+            return pool.map(_executar_run, tarefas)
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+
 def resumir_results(results):
     """Agrega um conjunto de runs em estatísticas descritivas."""
     custos = [r["custo"] for r in results]
@@ -267,7 +366,8 @@ def comparar_multi_instancia(instancias=None):
         for alg_name, alg_cls in ALGORITMOS_HEURISTICOS:
             print(f"\n  Executando {alg_name} ({N_RUNS} runs)...")
             results = executar_algoritmo(alg_name, alg_cls, instancia,
-                                         runs=N_RUNS, seed_base=SEED_BASE)
+                                         runs=N_RUNS, seed_base=SEED_BASE,
+                                         n_processos=N_PROCESSOS)
             runs_por_alg[alg_name] = results
             melhor_run = min(results, key=lambda r: r["custo_objetivo"])
             with open(os.path.join(sol_dir, f"{nome}__{alg_name}.pkl"), "wb") as _f:
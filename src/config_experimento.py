@@ -33,3 +33,10 @@ INSTANCIAS = [
 
 N_RUNS = 30
 SEED_BASE = 42
+
+# Processos usados para paralelizar os runs de cada algoritmo
+# (1 → execução sequencial; None → os.cpu_count()). O padrão é 1: o tempo de
+# cada run é medido no relógio de parede, e com runs concorrentes disputando
+# CPU ele deixa de ser comparável ao do SolverExato (executado sozinho).
+# Paralelizar só acelera o experimento; use-o quando os tempos não importarem.
+N_PROCESSOS = 1
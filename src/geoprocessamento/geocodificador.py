@@ -19,6 +19,7 @@ Armazenado em `src/dados/cache_geocodificacao.json` como um dicionário
 import json
 import os
 import time
+import numpy as np
 import pandas as pd
 
 # Caminho do cache relativo a este arquivo
@@ -98,34 +99,38 @@ def geocodificar_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame
         Mesmo DataFrame com colunas `lat` e `lon` adicionadas.
     """
-    lats = []
-    lons = []
-
     total = len(df)
-    for i, (_, row) in enumerate(df.iterrows(), start=1):
-        endereco = _montar_endereco(row)
-        print(f"  [{i}/{total}] Geocodificando: {endereco}")
+    # Falhas ficam como NaN já na alocação
+    pos = np.full((total, 2), np.nan, dtype=np.float64)
+    for i, endereco in enumerate(_montar_enderecos(df)):
+        print(f"  [{i + 1}/{total}] Geocodificando: {endereco}")
         coords = geocodificar_endereco(endereco)
         if coords is not None:
-            lats.append(coords[0])
-            lons.append(coords[1])
+            pos[i] = coords
         else:
             print(f"    AVISO: geocodificação falhou para '{endereco}'")
-            lats.append(float("nan"))
-            lons.append(float("nan"))
 
     df = df.copy()
-    df["lat"] = lats
-    df["lon"] = lons
+    df["lat"] = pos[:, 0]
+    df["lon"] = pos[:, 1]
     return df
 
 
-def _montar_endereco(row: pd.Series) -> str:
-    """Constrói string de endereço para geocodificação a partir de uma linha do DataFrame."""
-    partes = []
-    for col in ("endereco_entrega", "numero_endereco", "bairro_entrega", "municipio_entrega"):
-        val = str(row.get(col, "")).strip()
-        if val and val.lower() != "nan":
-            partes.append(val)
-    partes.append("Brasil")
-    return ", ".join(partes)
+_COLUNAS_ENDERECO = ("endereco_entrega", "numero_endereco", "bairro_entrega", "municipio_entrega")
+
+
+def _montar_enderecos(df: pd.DataFrame) -> list[str]:
+    """Constrói as strings de endereço para geocodificação de todas as linhas.
+
+    Operações vetorizadas do pandas (`.str`), sem iterar linha a linha:
+    cada coluna presente contribui com "valor, " quando não vazia/nula, e
+    o endereço termina em "Brasil".
+    """
+    enderecos = pd.Series("", index=df.index, dtype=object)
+    for col in _COLUNAS_ENDERECO:
+        if col not in df.columns:
+            continue
+        val = df[col].astype(str).str.strip()
+        valido = df[col].notna() & (val != "") & (val.str.lower() != "nan")
+        enderecos = enderecos + (val + ", ").where(valido, "")
+    return (enderecos + "Brasil").tolist()
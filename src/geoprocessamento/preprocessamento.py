@@ -11,15 +11,50 @@ COLUNAS_OBRIGATORIAS = frozenset({
     "municipio_entrega",
 })
 
-# Colunas legadas removidas automaticamente (não usadas pelos algoritmos)
+# Colunas legadas removidas automaticamente (não usadas pelos algoritmos).
+# `posicao` é a posição inteira do pedido na sequência de entrega do
+# exportador, não coordenadas: lat/lon vêm do CSV ou do geocodificador.
 _COLUNAS_LEGADAS = ("sequencia_entrega", "posicao")
 
 
+# Tipos explícitos para pular a inferência do pandas nas colunas consumidas
+# pelo pipeline; as demais colunas do CSV são lidas normalmente e preservadas.
+# `valor_total` e `pedido` ficam de fora: são convertidos/validados em
+# `limpar_pedidos`.
+_DTYPES = {
+    "endereco_entrega": str,
+    "numero_endereco": str,
+    "bairro_entrega": str,
+    "municipio_entrega": str,
+    "lat": "float64",
+    "lon": "float64",
+    "janela_inicio": "float64",
+    "janela_fim": "float64",
+    "tempo_servico": "float64",
+}
+
+
+def _read_csv(path: str, colunas: list, **kwargs) -> pd.DataFrame:
+    """`pd.read_csv` de todas as colunas, com tipos explícitos onde conhecidos.
+
+    Usa o engine "pyarrow" quando instalado e compatível com as opções
+    (ele não aceita `decimal=","` nem `skiprows`); senão, o engine "c".
+    """
+    dtype = {c: t for c, t in _DTYPES.items() if c in colunas}
+    if kwargs.get("decimal", ".") == "." and "skiprows" not in kwargs:
+        try:
+            return pd.read_csv(path, dtype=dtype, engine="pyarrow", **kwargs)
+        except (ImportError, ValueError):
+            pass
+    return pd.read_csv(path, dtype=dtype, engine="c", **kwargs)
+
+
 def _ler_csv_robusto(path: str) -> pd.DataFrame:
     """Lê CSV suportando separador , ou ; e notação decimal brasileira (vírgula).
 
     Trata também o caso em que o cabeçalho usa um separador diferente dos dados
-    (p. ex. cabeçalho com vírgula e dados com ponto-e-vírgula).
+    (p. ex. cabeçalho com vírgula e dados com ponto-e-vírgula). Colunas
+    conhecidas recebem tipos explícitos (ver `_read_csv`).
     """
     with open(path, encoding="utf-8", errors="replace") as f:
         header_linha = f.readline().rstrip("\n")
@@ -27,14 +62,14 @@ def _ler_csv_robusto(path: str) -> pd.DataFrame:
 
     sep_header = ";" if header_linha.count(";") > header_linha.count(",") else ","
     sep_dados  = ";" if dados_linha.count(";")  > dados_linha.count(",")  else ","
+    colunas = [c.strip() for c in header_linha.split(sep_header)]
 
     if sep_header == sep_dados:
         decimal = "," if sep_dados == ";" else "."
-        return pd.read_csv(path, sep=sep_dados, decimal=decimal)
+        return _read_csv(path, colunas, sep=sep_dados, decimal=decimal)
 
     # Cabeçalho e dados com separadores diferentes (formato legado do exportador)
-    colunas = [c.strip() for c in header_linha.split(sep_header)]
-    return pd.read_csv(path, sep=sep_dados, skiprows=1, names=colunas, decimal=",")
+    return _read_csv(path, colunas, sep=sep_dados, skiprows=1, names=colunas, decimal=",")
 
 
 def _validar_formato(df: pd.DataFrame, path: str) -> None:
@@ -1,6 +1,131 @@
+import hashlib
+import math
+import os
+
 import pandas as pd
 import numpy as np
 
+from utilitarios._jit import njit, prange, NUMBA_DISPONIVEL
+
+# Raio médio da Terra (m), usado na distância haversine
+RAIO_TERRA_M = 6371000.0
+
+
+def _pairwise_blocked(P, B=512, out=None):
+    """Distâncias euclidianas entre as linhas de `P`, calculadas em blocos B x B.
+
+    Cada bloco usa a identidade de Gram com o produto `P[i] @ P[j].T`
+    (BLAS) e temporários de B x B, que cabem no cache, em vez de matrizes
+    n x n intermediárias. Só os blocos do triângulo superior são
+    calculados; o inferior é o espelho. As posições são centralizadas
+    antes, pois lat/lon próximas e longe da origem perderiam precisão no
+    cancelamento; o quadrado é truncado em 0 antes da raiz.
+
+    `out` (n x n, p.ex. float32 ou `np.memmap`) recebe o resultado; por
+    padrão é alocado em float64.
+    """
+    P = np.asarray(P, dtype=np.float64)
+    P = P - P.mean(axis=0)
+    s = np.einsum("ij,ij->i", P, P)
+    n = len(P)
+    if out is None:
+        out = np.empty((n, n), dtype=np.float64)
+    for i in range(0, n, B):
+        i1 = min(i + B, n)
+        for j in range(i, n, B):
+            j1 = min(j + B, n)
+            d2 = s[i:i1, None] + s[None, j:j1] - 2.0 * (P[i:i1] @ P[j:j1].T)
+            np.maximum(d2, 0.0, out=d2)
+            np.sqrt(d2, out=d2)
+            if i == j:
+                # Bloco diagonal: simetriza com o triângulo superior e zera a
+                # diagonal (o resíduo de arredondamento do Gram daria sqrt(eps))
+                d2 = np.triu(d2, 1) + np.triu(d2, 1).T
+            out[i:i1, j:j1] = d2
+            out[j:j1, i:i1] = d2.T
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _fill_dist(P, D):
+    """Preenche `D` (n x n) com as distâncias euclidianas entre as linhas de `P`.
+
+    Linhas distribuídas entre os núcleos (`prange`); cada par é calculado
+    uma vez, pelas diferenças diretas, e espelhado.
+    """
+    n = P.shape[0]
+    for i in prange(n):
+        D[i, i] = 0.0
+        for j in range(i + 1, n):
+            dx = P[i, 0] - P[j, 0]
+            dy = P[i, 1] - P[j, 1]
+            # sqrt explícito em vez de math.hypot: ~3x mais rápido no JIT e
+            # coordenadas geográficas não chegam perto de overflow
+            d = math.sqrt(dx * dx + dy * dy)
+            D[i, j] = d
+            D[j, i] = d
+
+
+def _distancias_quadradas(pos, out):
+    """Preenche `out` (n x n) com `_fill_dist` (Numba) ou, sem o JIT, em blocos."""
+    if NUMBA_DISPONIVEL:
+        _fill_dist(pos, np.asarray(out))
+    else:
+        _pairwise_blocked(pos, out=out)
+    return out
+
+
+def _indice_condensado(i, j, n):
+    """Índice do par (i, j), i != j, no vetor condensado de `pdist` (triângulo superior)."""
+    if i > j:
+        i, j = j, i
+    return n * i - i * (i + 1) // 2 + (j - i - 1)
+
+
+def _expandir_condensada(condensada, n):
+    """Matriz quadrada simétrica (diagonal zero) a partir do vetor condensado."""
+    try:
+        from scipy.spatial.distance import squareform
+    except ImportError:
+        M = np.zeros((n, n), dtype=condensada.dtype)
+        iu = np.triu_indices(n, 1)
+        M[iu] = condensada
+        M.T[iu] = condensada
+        return M
+    return squareform(condensada, checks=False)
+
+
+def _matriz_memmap(pos, path):
+    """Matriz euclidiana (n x n, float32) em `np.memmap` no arquivo `path`.
+
+    Ao lado do arquivo fica `path + ".sha256"`, o hash das posições que o
+    geraram. O arquivo só é reaproveitado (somente leitura) se tiver n*n
+    float32 e o hash conferir; caso contrário é recriado e preenchido
+    direto no arquivo (`_distancias_quadradas`), sem alocar a matriz
+    inteira em memória.
+    """
+    n = len(pos)
+    nbytes = n * n * np.dtype(np.float32).itemsize
+    assinatura = hashlib.sha256(np.ascontiguousarray(pos, dtype=np.float64).tobytes()).hexdigest()
+    path_hash = path + ".sha256"
+    if os.path.exists(path) and os.path.getsize(path) == nbytes and os.path.exists(path_hash):
+        with open(path_hash) as f:
+            if f.read().strip() == assinatura:
+                return np.memmap(path, dtype=np.float32, mode="r", shape=(n, n))
+
+    # Hash removido antes e gravado só no fim: um preenchimento
+    # interrompido nunca é tomado como válido
+    if os.path.exists(path_hash):
+        os.remove(path_hash)
+    M = np.memmap(path, dtype=np.float32, mode="w+", shape=(n, n))
+    _distancias_quadradas(pos, M)
+    np.fill_diagonal(M, 0.0)
+    M.flush()
+    with open(path_hash, "w") as f:
+        f.write(assinatura)
+    return M
+
+
 class Instancia:
     """
     Attributes
@@ -10,9 +135,24 @@ class Instancia:
     posicoes : list[tuple]
         Lista de tuplas (lat, lon) para cada nó, índice 0 é o depósito.
     matriz : numpy.ndarray | None
-        Matriz de distâncias (n x n). Pode ser gerada ficticiamente ou carregada.
-    demandas : list[float]
-        Demanda de cada nó (unidades). Índice 0 corresponde ao depósito e normalmente tem demanda 0.
+        Matriz de distâncias (n x n) em float32. Pode ser gerada ficticiamente ou
+        carregada; consumidores devem aceitar float32 (custos são acumulados em float64).
+        Quando só a forma condensada existe, é expandida sob demanda (`as_square`).
+    matriz_condensada : numpy.ndarray | None
+        Triângulo superior da matriz euclidiana simétrica (n(n-1)/2, float32),
+        como devolvido por `pdist`; consultado por `dist(i, j)`.
+    somente_condensada : bool
+        Se True, a forma quadrada nunca é expandida (instâncias grandes):
+        acessar `matriz` levanta ValueError e as distâncias vêm de `dist` ou
+        `as_square`. Os solvers, `Solucao` e `ObjetivoConfig` leem `matriz`,
+        então não funcionam nesse modo.
+    demandas : numpy.ndarray
+        Demanda de cada nó (unidades, float64). Índice 0 corresponde ao depósito e normalmente tem demanda 0.
+    tempos_servico : numpy.ndarray | None
+        Tempo de atendimento de cada nó (minutos, float64).
+    tw_start, tw_end : numpy.ndarray | None
+        Início e fim da janela de tempo de cada nó (minutos); colunas de
+        `janelas_tempo`, array (n, 2) cujas linhas desempacotam em (inicio, fim).
     capacidade_caminhao : int | None
         Capacidade (unidades) dos caminhões (fro­ta homogênea quando fornecido).
     n_clientes : int
@@ -23,13 +163,15 @@ class Instancia:
                  numero_caminhoes=None, carga_minima=0):
         self.df = df
         self.posicoes = posicoes
+        self.matriz_condensada = None
+        self.somente_condensada = False
         self.matriz = None
-        self.janelas_tempo  = None  # list[tuple[int,int]] — (inicio, fim) por nó, em minutos
-        self.tempos_servico = None  # list[int] — tempo de atendimento por nó, em minutos
+        self.janelas_tempo  = None  # np.ndarray (n, 2) — (inicio, fim) por nó, em minutos
+        self.tempos_servico = None  # np.ndarray (n,) — tempo de atendimento por nó, em minutos
         self.matriz_tempos  = None  # np.ndarray n×n — tempos de viagem em minutos
 
         n = len(posicoes)
-        self.demandas = list(demandas) if demandas is not None else [0.0] * n
+        self.demandas = demandas if demandas is not None else np.zeros(n)
         self.capacidade_caminhao = capacidade_caminhao
         self.n_clientes = max(0, n - 1)
         self.numero_caminhoes = numero_caminhoes
@@ -116,9 +258,9 @@ class Instancia:
 
         # Demandas: coluna valor_total; depósito (índice 0) recebe 0.0
         if "valor_total" in df.columns:
-            demandas = df["valor_total"].fillna(0).astype(float).tolist()
+            demandas = df["valor_total"].fillna(0).to_numpy(dtype=np.float64, copy=True)
         else:
-            demandas = [0.0] * len(df)
+            demandas = np.zeros(len(df))
         demandas[0] = 0.0  # garante que o depósito tem demanda zero
 
         if numero_caminhoes is None:
@@ -135,7 +277,9 @@ class Instancia:
         )
 
         if matriz_real is not None:
-            instancia.matriz = matriz_real
+            # Contígua em float32 (metros cabem com folga): metade da banda de
+            # memória nos laços quentes que indexam M[a, b]
+            instancia.matriz = np.ascontiguousarray(matriz_real, dtype=np.float32)
             if matriz_tempos_osrm is not None:
                 instancia.matriz_tempos = matriz_tempos_osrm
             else:
@@ -145,10 +289,13 @@ class Instancia:
             instancia.gerar_matriz_distancias_ficticia()
             instancia.matriz_tempos = instancia.gerar_matriz_tempos_ficticia()
 
-        instancia.janelas_tempo  = list(zip(
-            df["janela_inicio"].astype(int), df["janela_fim"].astype(int)
-        ))
-        instancia.tempos_servico = df["tempo_servico"].astype(int).tolist()
+        # Janelas direto das colunas, como array (n, 2); `janelas_tempo[i]`
+        # continua desempacotando em (inicio, fim) e `.tolist()` dá as listas
+        instancia.janelas_tempo = np.column_stack([
+            df["janela_inicio"].fillna(0).to_numpy(dtype=np.float64, copy=True),
+            df["janela_fim"].fillna(1440).to_numpy(dtype=np.float64, copy=True),
+        ])
+        instancia.tempos_servico = df["tempo_servico"].fillna(0).to_numpy(dtype=np.float64, copy=True)
 
         instancia.validar()
         return instancia
@@ -159,20 +306,120 @@ class Instancia:
         1 grau ≈ 111 km; 111 km / 40 km/h × 60 min/h = 166,5 min/grau.
         Deve ser chamado após gerar_matriz_distancias_ficticia().
         """
-        return self.matriz * 166.5
+        return self.matriz.astype(np.float64) * 166.5
+
+    def gerar_matriz_distancias_ficticia(self, somente_condensada=False, mmap_path=None):
+        """Matriz euclidiana entre as posições.
+
+        Usa `scipy.spatial.distance.pdist` (só os n(n-1)/2 pares distintos,
+        aproveitando a simetria); sem o SciPy instalado, usa o preenchimento
+        paralelo `_fill_dist` (Numba) ou, sem o JIT, o NumPy. O cálculo é
+        feito em float64 (lat/lon próximas perderiam precisão nas diferenças)
+        e o resultado é armazenado em float32, na forma condensada. A forma quadrada é expandida no
+        primeiro acesso a `matriz`. Com `somente_condensada=True` ela não é
+        expandida (metade da memória em instâncias grandes), mas só `dist` e
+        `as_square` ficam disponíveis — os solvers exigem a forma quadrada.
+
+        Com `mmap_path`, a matriz quadrada fica em um arquivo mapeado em
+        memória (`np.memmap`, float32), preenchido direto no arquivo: o SO
+        pagina só as linhas usadas. Se o arquivo já existir e tiver sido
+        gerado pelas mesmas posições (hash em `mmap_path + ".sha256"`), é
+        aberto somente para leitura, sem recalcular.
+        """
+        pos = np.asarray(self.posicoes, dtype=np.float64)
+        if mmap_path is not None:
+            self.matriz = _matriz_memmap(pos, mmap_path)
+            return
+        try:
+            from scipy.spatial.distance import pdist
+        except ImportError:
+            n = len(pos)
+            quadrada = _distancias_quadradas(pos, np.empty((n, n), dtype=np.float64))
+            condensada = quadrada[np.triu_indices(n, 1)]
+        else:
+            condensada = pdist(pos, metric="euclidean")
+        self.matriz = None
+        self.matriz_condensada = condensada.astype(np.float32, copy=False)
+        self.somente_condensada = somente_condensada
 
-    def gerar_matriz_distancias_ficticia(self):
-        n = len(self.posicoes)
-        self.matriz = np.zeros((n, n))
+    def gerar_matriz_distancias_haversine(self):
+        """Matriz de distâncias geodésicas (haversine, em metros) entre as posições.
 
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    self.matriz[i][j] = 0
-                else:
-                    self.matriz[i][j] = np.linalg.norm(
-                        np.array(self.posicoes[i]) - np.array(self.posicoes[j])
-                    )
+        Ao contrário da euclidiana em graus, considera que um grau de
+        longitude encolhe com a latitude; fica na mesma unidade da matriz
+        OSRM. Calculada por broadcasting e armazenada em float32.
+        """
+        P = np.deg2rad(np.asarray(self.posicoes, dtype=np.float64))
+        lat, lon = P[:, 0:1], P[:, 1:2]
+        dlat = lat - lat.T
+        dlon = lon - lon.T
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+        np.clip(a, 0.0, 1.0, out=a)
+        self.matriz = (2 * RAIO_TERRA_M * np.arcsin(np.sqrt(a))).astype(np.float32)
+        np.fill_diagonal(self.matriz, 0.0)
+
+    @property
+    def matriz(self):
+        if self._matriz is None and self.matriz_condensada is not None:
+            if self.somente_condensada:
+                raise ValueError(
+                    "Instância em modo somente_condensada: use dist(i, j) ou as_square(); "
+                    "os algoritmos exigem a matriz quadrada (gere-a sem somente_condensada)"
+                )
+            self._matriz = self.as_square()
+        return self._matriz
+
+    @matriz.setter
+    def matriz(self, matriz):
+        # Uma matriz atribuída diretamente substitui a forma condensada
+        self._matriz = matriz
+        self.matriz_condensada = None
+
+    def as_square(self):
+        """Matriz de distâncias (n x n) expandida a partir da forma condensada."""
+        if self.matriz_condensada is None:
+            return self._matriz
+        return _expandir_condensada(self.matriz_condensada, len(self.posicoes))
+
+    def dist(self, i, j):
+        """Distância entre os nós `i` e `j`, sem expandir a forma condensada."""
+        if self.matriz_condensada is None:
+            return self._matriz[i, j]
+        if i == j:
+            return self.matriz_condensada.dtype.type(0)
+        return self.matriz_condensada[_indice_condensado(i, j, len(self.posicoes))]
+
+    # Dados por nó guardados como arrays tipados contíguos (estrutura de
+    # arrays): os setters convertem listas recebidas de chamadores antigos.
+
+    @property
+    def demandas(self):
+        return self._demandas
+
+    @demandas.setter
+    def demandas(self, demandas):
+        self._demandas = np.asarray(demandas, dtype=np.float64)
+
+    @property
+    def tempos_servico(self):
+        return self._tempos_servico
+
+    @tempos_servico.setter
+    def tempos_servico(self, tempos):
+        self._tempos_servico = None if tempos is None else np.asarray(tempos, dtype=np.float64)
+
+    @property
+    def janelas_tempo(self):
+        return self._janelas_tempo
+
+    @janelas_tempo.setter
+    def janelas_tempo(self, janelas):
+        if janelas is None:
+            self._janelas_tempo = self.tw_start = self.tw_end = None
+            return
+        self._janelas_tempo = np.asarray(janelas, dtype=np.float64).reshape(-1, 2)
+        self.tw_start = self._janelas_tempo[:, 0]
+        self.tw_end = self._janelas_tempo[:, 1]
 
     def verificar_factibilidade(self):
         """Verifica se o problema é matematicamente factível com a frota disponível.
@@ -181,7 +428,7 @@ class Instancia:
         """
         if self.capacidade_caminhao is None or self.numero_caminhoes is None:
             return
-        demanda_total = sum(self.demandas[1:])  # exclui depósito (índice 0)
+        demanda_total = float(self.demandas[1:].sum())  # exclui depósito (índice 0)
         capacidade_total = self.capacidade_caminhao * self.numero_caminhoes
         if demanda_total > capacidade_total:
             raise ValueError(
@@ -221,12 +468,11 @@ class Instancia:
         if len(self.demandas) != n:
             raise ValueError(f"Comprimento inválido em 'demandas': esperado {n} (igual a 'posicoes'), obtido {len(self.demandas)}")
 
-        # Demandas: numéricas e não-negativas
-        for idx, d in enumerate(self.demandas):
-            if not isinstance(d, numeros.Number):
-                raise TypeError(f"'demandas' inválida no índice {idx}: esperado numérico, obteve {type(d)}")
-            if d < 0:
-                raise ValueError(f"'demandas' inválida no índice {idx}: demanda deve ser >= 0, obteve {d}")
+        # Demandas: finitas e não-negativas (o setter já garante array numérico)
+        invalidas = np.flatnonzero(~np.isfinite(self.demandas) | (self.demandas < 0))
+        if invalidas.size > 0:
+            idx = int(invalidas[0])
+            raise ValueError(f"'demandas' inválida no índice {idx}: demanda deve ser finita e >= 0, obteve {self.demandas[idx]}")
 
         # Capacidade do caminhão: se fornecida, deve ser positiva e >= maior demanda
         if self.capacidade_caminhao is not None:
@@ -234,12 +480,21 @@ class Instancia:
                 raise TypeError(f"'capacidade_caminhao' inválida: esperado numérico, obteve {type(self.capacidade_caminhao)}")
             if self.capacidade_caminhao <= 0:
                 raise ValueError(f"'capacidade_caminhao' inválida: deve ser > 0, obteve {self.capacidade_caminhao}")
-            max_d = max(self.demandas) if self.demandas else 0
+            max_d = float(self.demandas.max()) if len(self.demandas) else 0
             if self.capacidade_caminhao < max_d:
                 raise ValueError(f"'capacidade_caminhao' inválida: {self.capacidade_caminhao} < maior demanda {max_d}")
 
         # Validações da matriz de distâncias
-        if self.matriz is None:
+        if self._matriz is None and self.matriz_condensada is not None:
+            # Só a forma condensada: valida o vetor sem expandir (simetria e
+            # diagonal zero valem por construção)
+            c = self.matriz_condensada
+            if c.shape != (n * (n - 1) // 2,):
+                raise ValueError(f"Matriz condensada inválida: esperado shape ({n * (n - 1) // 2},), obteve {c.shape}")
+            ruins = np.flatnonzero(~np.isfinite(c) | (c < 0))
+            if ruins.size > 0:
+                raise ValueError(f"Matriz condensada inválida: valor não finito ou negativo no índice {int(ruins[0])} = {c[ruins[0]]}")
+        elif self.matriz is None:
             if requer_matriz:
                 raise ValueError("'matriz' é None: gere ou carregue uma matriz antes de executar os algoritmos")
         else:
@@ -1,9 +1,93 @@
+import numpy as np
+
+from utilitarios.custos import path_cost
+
+
+def _matriz_kernel(matriz):
+    """Matriz no formato das assinaturas de `path_cost` (float32/float64 C-contígua)."""
+    M = np.asarray(matriz)
+    if M.dtype != np.float32:
+        M = M.astype(np.float64, copy=False)
+    return np.ascontiguousarray(M)
+
+
 class Representacao:
     def __init__(self, rota):
+        self._versao = 0
+        self._prefix = None
+        self._prefix_chave = None
         self.rota = rota
 
+    @property
+    def rota(self):
+        return self._rota
+
+    @rota.setter
+    def rota(self, rota):
+        # `rota_arr` (int32 contíguo) acompanha cada atribuição de `rota`;
+        # mutações in-place da lista exigem reatribuir `rota`.
+        self._rota = rota
+        self.rota_arr = np.asarray(rota, dtype=np.int32)
+        self._versao += 1
+
     def custo(self, matriz):
-        total = 0
-        for i in range(len(self.rota)-1):
-            total += matriz[self.rota[i]][self.rota[i+1]]
-        return total
+        return path_cost(_matriz_kernel(matriz), self.rota_arr)
+
+    def _prefixo(self, matriz):
+        """Somas prefixadas das arestas: `prefix[k]` = custo de rota[0..k].
+
+        Cacheado por (id da matriz, versão da rota); a versão muda a cada
+        atribuição de `rota`.
+        """
+        chave = (id(matriz), self._versao)
+        if self._prefix_chave != chave:
+            M = np.asarray(matriz)
+            r = self.rota_arr
+            arestas = M[r[:-1], r[1:]]
+            self._prefix = np.concatenate(([0.0], np.cumsum(arestas, dtype=np.float64)))
+            self._prefix_chave = chave
+        return self._prefix
+
+    def delta_swap(self, i, j, matriz):
+        """Variação de custo ao trocar os nós das posições `i` e `j` (0 < i < j < len-1).
+
+        Só as arestas vizinhas às duas posições mudam: as antigas saem das
+        somas prefixadas e as novas são lidas da matriz, em O(1). O trecho
+        entre `i` e `j` mantém o sentido, então vale para matrizes assimétricas.
+        """
+        M = np.asarray(matriz)
+        p = self._prefixo(matriz)
+        r = self.rota_arr
+        a, b = r[i], r[j]
+        if j == i + 1:
+            antigo = p[j + 1] - p[i - 1]
+            novo = M[r[i - 1], b] + M[b, a] + M[a, r[j + 1]]
+        else:
+            antigo = (p[i + 1] - p[i - 1]) + (p[j + 1] - p[j - 1])
+            novo = (M[r[i - 1], b] + M[b, r[i + 1]]
+                    + M[r[j - 1], a] + M[a, r[j + 1]])
+        return float(novo) - float(antigo)
+
+    @classmethod
+    def custos_batch(cls, rotas_2d, matriz):
+        """Custos (K,) de K rotas empilhadas em uma matriz (K, L) de índices.
+
+        Um único gather + redução no NumPy em vez de K chamadas a `custo`.
+        Rotas mais curtas podem ser completadas com o depósito (0) no final,
+        já que `matriz[0, 0] == 0`. Acumulado em float64.
+        """
+        R = np.asarray(rotas_2d, dtype=np.intp)
+        M = np.asarray(matriz)
+        return M[R[:, :-1], R[:, 1:]].sum(axis=1, dtype=np.float64)
+
+    @staticmethod
+    def custo_array(matriz, rota_arr):
+        """Custo da rota (array de índices) sem instanciar o wrapper.
+
+        Mesmo kernel de `custo`: soma o caminho aberto, sem fechar rotas
+        que não voltam ao depósito.
+        """
+        rota_arr = np.ascontiguousarray(rota_arr)
+        if rota_arr.dtype != np.int32:
+            rota_arr = rota_arr.astype(np.intp, copy=False)
+        return path_cost(_matriz_kernel(matriz), rota_arr)
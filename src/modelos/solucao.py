@@ -1,7 +1,9 @@
 import statistics
 
-from modelos.representacao import Representacao
+import numpy as np
+
 from modelos.objetivo_config import ObjetivoConfig
+from modelos.representacao import Representacao
 
 
 class Solucao:
@@ -37,7 +39,7 @@ class Solucao:
 
         total = 0.0
         for rota in self.rotas:
-            total += Representacao(rota).custo(matriz)
+            total += Representacao.custo_array(matriz, np.asarray(rota, dtype=np.intp))
 
         self.custo = total
         return total
@@ -144,7 +146,7 @@ class Solucao:
             for node in rota:
                 if node == 0:
                     continue
-                t_chegada = tempo_atual + float(matriz_tempos[pos_ant][node])
+                t_chegada = tempo_atual + float(matriz_tempos[pos_ant, node])
                 ini, fim = janelas_tempo[node]
                 if t_chegada < ini:
                     tempo_atual = ini + float(tempos_servico[node])        # espera
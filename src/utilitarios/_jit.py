@@ -0,0 +1,19 @@
+"""Compatibilidade com o Numba (dependência opcional).
+
+Sem o Numba instalado, `njit` vira um decorador identidade e `prange`
+equivale a `range`: os kernels continuam corretos, apenas sem compilação.
+Os chamadores que têm um caminho NumPy equivalente consultam
+`NUMBA_DISPONIVEL` para escolhê-lo quando o JIT não está presente.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_DISPONIVEL = True
+except ImportError:  # pragma: no cover - depende do ambiente
+    NUMBA_DISPONIVEL = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -0,0 +1,14 @@
+"""Geradores de números aleatórios dos solvers."""
+
+import numpy as np
+
+
+def obter_rng(rng=None):
+    """Devolve `rng` ou, sem ele, um Generator derivado do estado global de np.random.
+
+    O estado global é semeado pelo comparador a cada run, então o Generator
+    derivado mantém os runs reprodutíveis mesmo sem `rng` explícito.
+    """
+    if rng is not None:
+        return rng
+    return np.random.default_rng(np.random.randint(2**31))
@@ -42,7 +42,7 @@ def nearest_neighbor_capacitado(instancia, inicio_deposito=True):
             for cliente in nao_visitados:
                 demanda_cliente = demandas[cliente]
                 if carga_atual + demanda_cliente <= capacidade:
-                    distancia = matriz[posicao_atual][cliente]
+                    distancia = matriz[posicao_atual, cliente]
                     if distancia < melhor_distancia:
                         melhor_distancia = distancia
                         melhor_cliente = cliente
@@ -91,7 +91,7 @@ def savings_parallel(instancia):
     savings = []
     for i in range(1, n):
         for j in range(i + 1, n):
-            saving = matriz[deposito][i] + matriz[deposito][j] - matriz[i][j]
+            saving = matriz[deposito, i] + matriz[deposito, j] - matriz[i, j]
             savings.append((saving, i, j))
     savings.sort(reverse=True, key=lambda x: x[0])
 
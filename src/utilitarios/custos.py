@@ -0,0 +1,132 @@
+"""Kernels de custo de rota compartilhados pelos modelos e pelos algoritmos.
+
+As rotas chegam como arrays inteiros (`np.intp`) com o depósito nas duas
+pontas, no mesmo formato de `Solucao.rotas`. `path_cost` soma o caminho
+como recebido, sem fechar. Em `delta_cost`, um tour aberto (primeiro nó
+diferente do último, como uma permutação de TSP) é tratado como ciclo: a
+aresta de fechamento `(rota[-1], rota[0])` entra nas bordas do 2-opt.
+Com o Numba disponível os kernels são compilados; caso contrário usam
+indexação vetorizada do NumPy. A matriz pode ser float32 (padrão de
+`Instancia`); custos e deltas são sempre acumulados em float64.
+"""
+
+import numpy as np
+
+from utilitarios._jit import njit, NUMBA_DISPONIVEL
+
+
+if NUMBA_DISPONIVEL:
+
+    from numba import types
+
+    # Assinaturas explícitas (compilação antecipada, um laço por dtype):
+    # matriz C-contígua e índices contíguos deixam o LLVM vetorizar o
+    # gather + redução. O acumulador é float64 mesmo com matriz float32.
+    # Cada array também aparece somente leitura (p.ex. `np.memmap` com
+    # mode="r" da matriz em cache).
+    _ASSINATURAS_PATH = [
+        types.float64(types.Array(dm, 2, "C", readonly=rm), types.Array(di, 1, "C", readonly=ri))
+        for dm in (types.float32, types.float64)
+        for di in (types.int32, types.int64)
+        for rm in (False, True)
+        for ri in (False, True)
+    ]
+
+    @njit(_ASSINATURAS_PATH, cache=True, fastmath=True)
+    def path_cost(M, rota):
+        """Soma das arestas consecutivas de `rota` em `M` (caminho aberto)."""
+        total = 0.0
+        for k in range(rota.shape[0] - 1):
+            total += M[rota[k], rota[k + 1]]
+        return total
+
+    @njit(cache=True)
+    def delta_cost(M, rota, i, j):
+        """Variação de custo ao inverter `rota[i..j]` (2-opt), com i < j.
+
+        Além das 4 arestas de borda, soma a diferença das arestas internas
+        invertidas, o que mantém o delta exato para matrizes assimétricas.
+        Em rotas fechadas no depósito, 0 < i < j < len-1; em tours abertos
+        `i == 0` / `j == len-1` usam a aresta de fechamento como borda
+        (exceto a inversão do tour inteiro).
+        """
+        L = rota.shape[0]
+        a, b = rota[(i - 1) % L], rota[i]
+        c, d = rota[j], rota[(j + 1) % L]
+        delta = 0.0 + M[a, c] + M[b, d] - M[a, b] - M[c, d]
+        for k in range(i, j):
+            delta += M[rota[k + 1], rota[k]] - M[rota[k], rota[k + 1]]
+        return delta
+
+else:
+
+    def path_cost(M, rota):
+        """Soma das arestas consecutivas de `rota` em `M` (caminho aberto)."""
+        return float(M[rota[:-1], rota[1:]].sum(dtype=np.float64))
+
+    def delta_cost(M, rota, i, j):
+        """Variação de custo ao inverter `rota[i..j]` (2-opt), com i < j.
+
+        Além das 4 arestas de borda, soma a diferença das arestas internas
+        invertidas, o que mantém o delta exato para matrizes assimétricas.
+        Em rotas fechadas no depósito, 0 < i < j < len-1; em tours abertos
+        `i == 0` / `j == len-1` usam a aresta de fechamento como borda
+        (exceto a inversão do tour inteiro).
+        """
+        L = rota.shape[0]
+        a, b = rota[(i - 1) % L], rota[i]
+        c, d = rota[j], rota[(j + 1) % L]
+        seg = rota[i:j + 1]
+        interno = (M[seg[1:], seg[:-1]].sum(dtype=np.float64)
+                   - M[seg[:-1], seg[1:]].sum(dtype=np.float64))
+        return float(M[a, c]) + float(M[b, d]) - float(M[a, b]) - float(M[c, d]) + interno
+
+
+if NUMBA_DISPONIVEL:
+
+    @njit(cache=True, nogil=True)
+    def deltas_2opt(M, rota):
+        """Matriz (L x L) de deltas 2-opt de uma rota fechada no depósito.
+
+        `[i, j]` é a variação de custo ao inverter `rota[i..j]` e +inf fora
+        dos movimentos válidos. Compilado uma vez (cache em disco, reaproveitado pelos workers) e
+        libera o GIL (`nogil=True`).
+        """
+        L = rota.shape[0]
+        out = np.full((L, L), np.inf)
+        for i in range(1, L - 2):
+            a, b = rota[i - 1], rota[i]
+            interno = 0.0  # arestas internas invertidas menos as originais
+            for j in range(i + 1, L - 1):
+                interno += M[rota[j], rota[j - 1]] - M[rota[j - 1], rota[j]]
+                c, d = rota[j], rota[j + 1]
+                out[i, j] = interno + M[a, c] + M[b, d] - M[a, b] - M[c, d]
+        return out
+
+else:
+
+    def deltas_2opt(M, rota):
+        """Matriz (L x L) de deltas 2-opt de uma rota fechada no depósito.
+
+        `[i, j]` é a variação de custo ao inverter `rota[i..j]` e +inf fora
+        dos movimentos válidos. As arestas internas do segmento invertido
+        entram via somas prefixadas nos dois sentidos.
+        """
+        L = len(rota)
+        deltas = np.full((L, L), np.inf)
+        if L < 4:
+            return deltas
+
+        ida = np.concatenate(([0.0], np.cumsum(M[rota[:-1], rota[1:]], dtype=np.float64)))
+        volta = np.concatenate(([0.0], np.cumsum(M[rota[1:], rota[:-1]], dtype=np.float64)))
+
+        k = np.arange(1, L - 1)
+        I, J = k[:, None], k[None, :]
+        # Acumula em float64 mesmo com matriz float32
+        d = (M[rota[I - 1], rota[J]].astype(np.float64) + M[rota[I], rota[J + 1]]
+             - M[rota[I - 1], rota[I]] - M[rota[J], rota[J + 1]]
+             + (volta[J] - volta[I]) - (ida[J] - ida[I]))
+
+        valido = np.triu(np.ones(d.shape, dtype=bool), k=1)
+        deltas[1:L - 1, 1:L - 1] = np.where(valido, d, np.inf)
+        return deltas
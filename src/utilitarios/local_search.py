@@ -1,4 +1,7 @@
+import numpy as np
+
 from modelos.solucao import Solucao
+from utilitarios.custos import delta_cost
 
 
 def _rota_tw_ok(rota, instancia):
@@ -14,7 +17,7 @@ def _rota_tw_ok(rota, instancia):
     for node in rota:
         if node == 0:
             continue
-        t_chegada = tempo_atual + float(matriz_tempos[pos_ant][node])
+        t_chegada = tempo_atual + float(matriz_tempos[pos_ant, node])
         ini, fim = janelas[node]
         if t_chegada > fim:
             return False
@@ -47,19 +50,17 @@ def two_opt_intra(solucao, instancia, config, max_passes=1):
             if len(rota) < 4:
                 continue
             tw_ok_antes = _rota_tw_ok(rota, instancia)
+            rota_arr = np.asarray(rota, dtype=np.intp)
             for i in range(1, len(rota) - 2):
                 for j in range(i + 1, len(rota) - 1):
-                    a, b = rota[i - 1], rota[i]
-                    c, d = rota[j], rota[j + 1]
-                    antes = matriz[a][b] + matriz[c][d]
-                    depois = matriz[a][c] + matriz[b][d]
-                    if depois < antes - 1e-9:
+                    if delta_cost(matriz, rota_arr, i, j) < -1e-9:
                         nova = rota[:i] + rota[i:j + 1][::-1] + rota[j + 1:]
                         # Em VRPTW, só aceita se não piora a viabilidade temporal.
                         if tw_ok_antes and not _rota_tw_ok(nova, instancia):
                             continue
                         rotas[idx] = nova
                         rota = nova
+                        rota_arr = np.asarray(rota, dtype=np.intp)
                         tw_ok_antes = _rota_tw_ok(rota, instancia)
                         melhorou = True
 
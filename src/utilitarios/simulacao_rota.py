@@ -41,7 +41,7 @@ def simular_rota(rota, instancia):
         if node == 0:
             continue
 
-        t_chegada = tempo_atual + float(matriz_tempos[pos_ant][node])
+        t_chegada = tempo_atual + float(matriz_tempos[pos_ant, node])
         ini, fim = janelas_tempo[node]
 
         if t_chegada < ini:
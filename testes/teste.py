@@ -372,6 +372,430 @@ def teste_factibilidade_factivel():
     print("✓ Teste 13 PASSOU")
 
 
+def teste_delta_2opt_tabu():
+    """Teste 14: delta vetorizado do 2-opt coincide com a avaliação completa."""
+    print("\n=== Teste 14: Delta 2-opt (Busca Tabu) ===")
+
+    instancia = criar_instancia_toy()
+    # Matriz assimétrica: o delta precisa considerar a inversão das arestas internas
+    instancia.matriz = np.array([
+        [0,  10, 20, 30],
+        [12,  0, 15, 25],
+        [21, 17,  0, 10],
+        [33, 26, 11,  0]
+    ], dtype=float)
+
+    tabu = BuscaTabu(instancia)
+    sol = Solucao(rotas=[[0, 1, 2, 3, 0]], instancia=instancia)
+    custo_atual = tabu._avaliar_solucao(sol)
+
+    deltas = {}
+    for move_id in tabu._gen_moves_2opt(sol):
+        custo_delta = tabu._custo_2opt(sol, move_id, custo_atual, deltas)
+        custo_completo = tabu._avaliar_solucao(tabu._aplicar_move(sol, move_id))
+        assert abs(custo_delta - custo_completo) < 1e-6, \
+            f"{move_id}: delta={custo_delta}, completo={custo_completo}"
+
+    print(f"✓ {len(list(tabu._gen_moves_2opt(sol)))} movimentos conferidos")
+    print("✓ Teste 14 PASSOU")
+
+
+def teste_custo_tour_fechado():
+    """Teste 15: em tour aberto, o delta 2-opt inclui a aresta de fechamento."""
+    print("\n=== Teste 15: Aresta de Fechamento ===")
+    from utilitarios.custos import path_cost, delta_cost
+
+    def custo_ciclo(M, tour):
+        return path_cost(M, np.append(tour, tour[0]))
+
+    M = np.array([
+        [0,  10, 20, 30],
+        [12,  0, 15, 25],
+        [21, 17,  0, 10],
+        [33, 26, 11,  0]
+    ], dtype=float)
+
+    # Rota fechada no depósito: soma das arestas consecutivas
+    rota = np.array([0, 1, 2, 3, 0], dtype=np.intp)
+    assert path_cost(M, rota) == 10 + 15 + 10 + 33
+
+    # Tour aberto: os deltas nas pontas consideram a aresta (3 -> 0)
+    tour = np.array([0, 1, 2, 3], dtype=np.intp)
+    for i, j in [(0, 1), (0, 2), (1, 3), (2, 3)]:
+        novo = tour.copy()
+        novo[i:j + 1] = novo[i:j + 1][::-1]
+        esperado = custo_ciclo(M, novo) - custo_ciclo(M, tour)
+        assert abs(delta_cost(M, tour, i, j) - esperado) < 1e-9, (i, j)
+
+    print("✓ Teste 15 PASSOU")
+
+
+def teste_distancias_numpy():
+    """Teste 16: distâncias em blocos (Gram) e o preenchimento sem SciPy coincidem com a direta."""
+    print("\n=== Teste 16: Matriz de Distâncias sem SciPy ===")
+    from modelos.instancia import _pairwise_blocked, _distancias_quadradas
+
+    rng = np.random.default_rng(0)
+    # Coordenadas próximas e longe da origem, como lat/lon de BH
+    pos = np.array([-19.92, -43.94]) + rng.random((30, 2)) * 0.1
+    esperado = np.sqrt(((pos[:, None, :] - pos[None, :, :]) ** 2).sum(-1))
+
+    matriz = _pairwise_blocked(pos, B=8)  # vários blocos, inclusive parciais
+    assert matriz.shape == (30, 30)
+    assert np.all(np.diag(matriz) == 0)
+    assert np.allclose(matriz, esperado, atol=1e-10)
+
+    quadrada = _distancias_quadradas(pos, np.empty((30, 30)))
+    assert np.allclose(quadrada, esperado, atol=1e-10)
+
+    print("✓ Teste 16 PASSOU")
+
+
+def teste_distancias_haversine():
+    """Teste 17: matriz haversine em metros, simétrica e com diagonal zero."""
+    print("\n=== Teste 17: Matriz Haversine ===")
+
+    instancia = criar_instancia_toy()
+    # 0,01° de latitude ≈ 1112 m; 0,01° de longitude a -20° ≈ 1045 m
+    instancia.posicoes = [(-20.0, -44.0), (-19.99, -44.0), (-20.0, -43.99), (-19.99, -43.99)]
+    instancia.gerar_matriz_distancias_haversine()
+    M = instancia.matriz
+
+    assert M.shape == (4, 4)
+    assert np.allclose(M, M.T) and np.all(np.diag(M) == 0)
+    assert abs(M[0, 1] - 1111.95) < 1.0, M[0, 1]
+    assert abs(M[0, 2] - 1044.9) < 1.0, M[0, 2]
+
+    print(f"✓ d(0,1)={M[0, 1]:.1f} m, d(0,2)={M[0, 2]:.1f} m")
+    print("✓ Teste 17 PASSOU")
+
+
+def teste_instancia_atributos():
+    """Teste 18: Instancia única, com demandas e atributos VRPTW disponíveis."""
+    print("\n=== Teste 18: Atributos da Instância ===")
+    import inspect
+    import modelos.instancia as mod_instancia
+
+    fonte = inspect.getsource(mod_instancia)
+    assert fonte.count("class Instancia") == 1, "Instancia declarada mais de uma vez"
+
+    instancia = criar_instancia_toy()
+    assert isinstance(instancia.demandas, np.ndarray)
+    assert instancia.demandas.tolist() == [0, 10, 15, 20]
+    for atributo in ("janelas_tempo", "tempos_servico", "matriz_tempos", "tw_start", "tw_end"):
+        assert hasattr(instancia, atributo), f"Instancia sem '{atributo}'"
+
+    instancia.janelas_tempo = [(0, 1440), (480, 720), (780, 1020), (480, 720)]
+    assert instancia.tw_start.tolist() == [0, 480, 780, 480]
+    assert tuple(instancia.janelas_tempo[2]) == (780, 1020)
+
+    print("✓ Teste 18 PASSOU")
+
+
+def teste_delta_swap_representacao():
+    """Teste 19: delta_swap por somas prefixadas coincide com o custo recalculado."""
+    print("\n=== Teste 19: Delta Swap (Representacao) ===")
+    from modelos.representacao import Representacao
+
+    M = np.random.default_rng(1).random((7, 7)).astype(np.float32)  # assimétrica
+    rota = [0, 3, 1, 5, 2, 6, 4, 0]
+    rep = Representacao(rota)
+    custo = rep.custo(M)
+
+    for i in range(1, len(rota) - 2):
+        for j in range(i + 1, len(rota) - 1):
+            nova = list(rota)
+            nova[i], nova[j] = nova[j], nova[i]
+            esperado = Representacao(nova).custo(M) - custo
+            assert abs(rep.delta_swap(i, j, M) - esperado) < 1e-5, (i, j)
+
+    print("✓ Teste 19 PASSOU")
+
+
+def teste_matriz_condensada():
+    """Teste 20: forma condensada da matriz euclidiana, `dist` e `as_square`."""
+    print("\n=== Teste 20: Matriz Condensada ===")
+
+    instancia = criar_instancia_toy()
+    n = len(instancia.posicoes)
+    instancia.gerar_matriz_distancias_ficticia(somente_condensada=True)
+
+    assert instancia.matriz_condensada.shape == (n * (n - 1) // 2,)
+    M = instancia.as_square()
+    assert M.dtype == np.float32 and np.allclose(M, M.T) and np.all(np.diag(M) == 0)
+    for i in range(n):
+        for j in range(n):
+            assert instancia.dist(i, j) == M[i, j], (i, j)
+
+    # Modo somente condensado: `matriz` não é expandida
+    try:
+        instancia.matriz
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("matriz deveria levantar ValueError em modo somente_condensada")
+    instancia._validar()
+
+    instancia.gerar_matriz_distancias_ficticia()
+    assert instancia.matriz is instancia.matriz
+    assert np.array_equal(instancia.matriz, M)
+
+    print("✓ Teste 20 PASSOU")
+
+
+def teste_matriz_memmap():
+    """Teste 21: matriz euclidiana em arquivo mapeado, reaberta sem recalcular."""
+    print("\n=== Teste 21: Matriz em Memmap ===")
+    import tempfile
+
+    instancia = criar_instancia_toy()
+    instancia.gerar_matriz_distancias_ficticia()
+    esperado = np.array(instancia.matriz)
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "matriz.f32")
+        instancia.gerar_matriz_distancias_ficticia(mmap_path=path)
+        assert isinstance(instancia.matriz, np.memmap)
+        assert np.allclose(instancia.matriz, esperado, atol=1e-6)
+
+        # Segunda carga: arquivo existente é só mapeado para leitura
+        outra = criar_instancia_toy()
+        outra.gerar_matriz_distancias_ficticia(mmap_path=path)
+        assert outra.matriz.mode == "r"
+        assert np.array_equal(outra.matriz, instancia.matriz)
+
+        # Custos e solvers funcionam sobre a matriz somente leitura
+        sol = Solucao(rotas=[[0, 1, 2, 0], [0, 3, 0]], instancia=outra)
+        assert abs(sol.calcular_custo() - 10.0) < 1e-5  # (1 + 1 + 2) + (3 + 3)
+        sol = BuscaTabu(outra, max_iter=10, max_no_improve=5).run()
+        assert sol.custo_objetivo is not None
+        instancia.matriz = outra.matriz = None  # libera os mapeamentos
+
+        # Mesmo n com outras posições: hash não confere e a matriz é refeita
+        movida = criar_instancia_toy()
+        movida.posicoes = [(0.0, 0.0), (0.0, 1.0), (0.0, 3.0), (0.0, 6.0)]
+        movida.gerar_matriz_distancias_ficticia(mmap_path=path)
+        assert movida.matriz.mode == "w+"
+        assert abs(movida.matriz[0, 3] - 6.0) < 1e-6
+        movida.matriz = None
+
+    print("✓ Teste 21 PASSOU")
+
+
+def teste_custos_batch_representacao():
+    """Teste 22: custos_batch coincide com `custo` rota a rota."""
+    print("\n=== Teste 22: Custos em Lote (Representacao) ===")
+    from modelos.representacao import Representacao
+
+    M = np.random.default_rng(2).random((6, 6)).astype(np.float32)
+    np.fill_diagonal(M, 0.0)
+    rotas = np.array([
+        [0, 1, 2, 3, 4, 5, 0],
+        [0, 5, 4, 3, 2, 1, 0],
+        [0, 2, 4, 0, 0, 0, 0],  # completada com o depósito
+    ], dtype=np.int32)
+
+    custos = Representacao.custos_batch(rotas, M)
+    assert custos.shape == (3,)
+    for k, rota in enumerate(rotas):
+        assert abs(custos[k] - Representacao(rota.tolist()).custo(M)) < 1e-6
+
+    # custo e custo_array concordam também em rotas que não fecham no depósito
+    aberta = [0, 3, 1, 4]
+    esperado = float(M[0, 3]) + float(M[3, 1]) + float(M[1, 4])
+    assert abs(Representacao(aberta).custo(M) - esperado) < 1e-6
+    assert Representacao.custo_array(M, np.array(aberta)) == Representacao(aberta).custo(M)
+
+    print("✓ Teste 22 PASSOU")
+
+
+def teste_solver_exato_janelas():
+    """Teste 23: solver exato (OR-Tools) em instância com janelas de tempo."""
+    print("\n=== Teste 23: Solver Exato com Janelas de Tempo ===")
+    try:
+        from algoritmos.solver_exato import SolverExato
+    except ImportError:
+        print("OR-Tools não instalado; teste ignorado")
+        return
+
+    # Atendimento de 500 min com janelas até 400: nenhum cliente pode ser
+    # o segundo de uma rota, então são 3 rotas (tempos_servico é ndarray)
+    instancia = criar_instancia_toy()
+    instancia.numero_caminhoes = 3
+    instancia.matriz_tempos = instancia.matriz / 10
+    instancia.janelas_tempo = [(0, 1440), (0, 400), (0, 400), (0, 400)]
+    instancia.tempos_servico = [0, 500, 500, 500]
+
+    solucao = SolverExato(instancia, tempo_limite=2).run()
+
+    assert solucao.meta["vrptw"]
+    assert sorted(solucao.rotas) == [[0, 1, 0], [0, 2, 0], [0, 3, 0]], solucao.rotas
+    violacoes = solucao.verificar_janelas_tempo(instancia)
+    assert sum(len(v) for v in violacoes.values()) == 0, violacoes
+
+    print(f"✓ Rotas: {solucao.rotas} | custo={solucao.custo}")
+    print("✓ Teste 23 PASSOU")
+
+
+def teste_do_csv():
+    """Teste 24: Instancia.do_csv lê um CSV com coordenadas e monta a instância."""
+    print("\n=== Teste 24: Instância a partir de CSV ===")
+    import tempfile
+
+    csv = (
+        "pedido,valor_total,endereco_entrega,numero_endereco,bairro_entrega,municipio_entrega,lat,lon\n"
+        "1,10.5,R A,12,B,BH,-19.90,-43.90\n"
+        "2,7.25,R B,5,C,BH,-19.80,-43.80\n"
+        "3,3.0,R C,8,D,BH,-19.85,-43.95\n"
+    )
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "pedidos.csv")
+        with open(path, "w") as f:
+            f.write(csv)
+        os.chdir(d)  # `do_csv` grava pedidos_limpos.csv relativo ao diretório atual
+        try:
+            instancia = Instancia.do_csv(path, capacidade_caminhao=100, numero_caminhoes=2)
+        finally:
+            os.chdir(cwd)
+
+    assert instancia.n_clientes == 3
+    assert list(instancia.demandas) == [0.0, 10.5, 7.25, 3.0]
+    assert instancia.matriz.shape == (4, 4)
+    assert instancia.janelas_tempo.shape == (4, 2)
+    assert instancia.tempos_servico.shape == (4,)
+    assert instancia.demandas.flags.writeable and instancia.tempos_servico.flags.writeable
+
+    print("✓ Teste 24 PASSOU")
+
+
+def teste_limpar_pedidos_colunas():
+    """Teste 25: limpar_pedidos preserva as colunas do CSV (exceto legadas e vazia final)."""
+    print("\n=== Teste 25: Colunas do CSV Limpo ===")
+    import tempfile
+    from geoprocessamento.preprocessamento import limpar_pedidos
+
+    base = os.path.join(os.path.dirname(__file__), "..", "src", "dados", "pedidos_pequeno.csv")
+    df = limpar_pedidos(base)
+    assert list(df.columns) == [
+        "data_pedido", "pedido", "codigo_cliente", "nome_fantasia", "endereco_entrega",
+        "numero_endereco", "bairro_entrega", "municipio_entrega", "UF_entrega", "valor_total",
+    ], list(df.columns)
+
+    # Coluna vazia no final (artefato de exportação) é a última do arquivo
+    csv = (
+        "pedido;valor_total;endereco_entrega;numero_endereco;bairro_entrega;municipio_entrega;UF_entrega;\n"
+        "1;10,5;R A;12;B;BH;MG;\n"
+        "2;7,25;R B;5;C;BH;MG;\n"
+    )
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "pedidos.csv")
+        with open(path, "w") as f:
+            f.write(csv)
+        df = limpar_pedidos(path)
+    assert list(df.columns) == [
+        "pedido", "valor_total", "endereco_entrega", "numero_endereco",
+        "bairro_entrega", "municipio_entrega", "UF_entrega",
+    ], list(df.columns)
+    assert list(df["valor_total"]) == [10.5, 7.25]
+
+    print("✓ Teste 25 PASSOU")
+
+
+def teste_pso_step_sequencial():
+    """Teste 26: pso_step equivale a aplicar os swaps de inércia, pbest e gbest em sequência."""
+    print("\n=== Teste 26: Passo do PSO ===")
+    from algoritmos.enxame_particulas import pso_step
+
+    def swaps_para(a, b):
+        # Sequência de swaps que leva `a` a `b` (definição original do PSO)
+        a = list(a)
+        pos = {v: i for i, v in enumerate(a)}
+        swaps = []
+        for i in range(len(a)):
+            if a[i] != b[i]:
+                j = pos[b[i]]
+                swaps.append((i, j))
+                a[i], a[j] = a[j], a[i]
+                pos[a[j]] = j
+                pos[a[i]] = i
+        return swaps
+
+    for seed in range(200):
+        rng = np.random.default_rng(seed)
+        n = int(rng.integers(1, 13))
+        clientes = np.arange(1, n + 1)
+        particula = rng.permutation(clientes)
+        pbest, gbest = rng.permutation(clientes), rng.permutation(clientes)
+        c1, c2 = rng.random(), rng.random()
+        r_pbest, r_gbest = rng.random(n), rng.random(n)
+        swap_inercia = rng.integers(n, size=2) if rng.random() < 0.7 else None
+
+        # Referência: swaps disparados aplicados um a um sobre a posição atual
+        escolhidos = [] if swap_inercia is None else [tuple(swap_inercia)]
+        escolhidos += [sw for t, sw in enumerate(swaps_para(particula, pbest)) if r_pbest[t] < c1]
+        escolhidos += [sw for t, sw in enumerate(swaps_para(particula, gbest)) if r_gbest[t] < c2]
+        esperado = list(particula)
+        for i, j in escolhidos:
+            esperado[i], esperado[j] = esperado[j], esperado[i]
+
+        atual = particula.copy()
+        movidos = pso_step(atual, pbest, gbest, c1, c2, swap_inercia, r_pbest, r_gbest,
+                           np.empty(n, dtype=np.int64), np.empty(n + 1, dtype=np.int64),
+                           np.empty((2 * n + 1, 2), dtype=np.int64))
+        assert list(atual) == esperado, seed
+        assert movidos == int(np.sum(np.array(esperado) != particula)), seed
+
+    print("✓ Teste 26 PASSOU")
+
+
+def teste_comparador_pool():
+    """Teste 27: runs no Pool (memória compartilhada) coincidem com os sequenciais."""
+    print("\n=== Teste 27: Comparador em Paralelo ===")
+    from multiprocessing import shared_memory
+    import comparador
+
+    instancia = criar_instancia_toy()
+    instancia.matriz_tempos = instancia.matriz / 10
+    kwargs = {"max_iter": 10, "max_no_improve": 5}
+
+    # Registra os blocos criados para conferir que foram liberados
+    criados = []
+    original = comparador.shared_memory.SharedMemory
+
+    class Registrada(original):
+        def __init__(self, *args, **kw):
+            super().__init__(*args, **kw)
+            if kw.get("create"):
+                criados.append(self.name)
+
+    comparador.shared_memory.SharedMemory = Registrada
+    try:
+        paralelo = comparador.executar_algoritmo("Tabu", BuscaTabu, instancia, runs=2, seed_base=7,
+                                                 solver_kwargs=kwargs, n_processos=2)
+    finally:
+        comparador.shared_memory.SharedMemory = original
+    sequencial = comparador.executar_algoritmo("Tabu", BuscaTabu, instancia, runs=2, seed_base=7,
+                                               solver_kwargs=kwargs, n_processos=1)
+
+    for p, s in zip(paralelo, sequencial):
+        assert p["seed"] == s["seed"]
+        assert p["custo"] == s["custo"] and p["custo_objetivo"] == s["custo_objetivo"]
+        assert p["solucao"].rotas == s["solucao"].rotas
+        assert p["solucao"].instancia is instancia
+
+    assert len(criados) == 2  # matriz e matriz_tempos
+    for nome in criados:
+        try:
+            shared_memory.SharedMemory(name=nome).close()
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError(f"bloco de memória compartilhada {nome} não foi liberado")
+
+    print("✓ Teste 27 PASSOU")
+
+
 def teste_basico():
     """Executa teste básico do main (compatibilidade)."""
     print("\n=== Teste Básico: Main ===")
@@ -403,6 +827,20 @@ def executar_todos_testes():
         teste_carga_minima()
         teste_factibilidade_infactivel()
         teste_factibilidade_factivel()
+        teste_delta_2opt_tabu()
+        teste_custo_tour_fechado()
+        teste_distancias_numpy()
+        teste_distancias_haversine()
+        teste_instancia_atributos()
+        teste_delta_swap_representacao()
+        teste_matriz_condensada()
+        teste_matriz_memmap()
+        teste_custos_batch_representacao()
+        teste_solver_exato_janelas()
+        teste_do_csv()
+        teste_limpar_pedidos_colunas()
+        teste_pso_step_sequencial()
+        teste_comparador_pool()
 
         print("\n" + "="*60)
         print("✓ TODOS OS TESTES PASSARAM!")